@@ -1,68 +1,93 @@
-import matplotlib.pyplot as plt
-import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import numpy as np
-from datetime import datetime
+import argparse
+import hashlib
+import json
+import time
 import os
+from configuracion import CONFIG
+from esquema import claves_semana
+from estilo_graficas import COLUMNAS_DICTAMEN, COLUMNAS_PAGOS, barra_color_dictamen, texto_color
+from ingesta import leer_hoja
+from manifiestos import escribir_manifiesto, leer_manifiesto
+from preparacion import semana_graficas
+from medicion import MODO_MEDICION, Medicion
 
-df = pd.read_excel("D:/Cobranza/Streamlit/Resources/Data/op_sl_sem43.xlsx", sheet_name = "graficas")
+# Genera las gráficas de dictamen y pagos cumplidos de cada cobrador.
+# Los cobradores se reparten en un ProcessPoolExecutor; cada figura se dibuja
+# con la API de objetos (Figure + lienzo Agg), sin el estado global de pyplot.
+#
+# Cada carpeta Visualizations/<semana> lleva un manifest.json con el hash de
+# los datos de cada cobrador y de los ajustes de estilo: al volver a correr
+# sólo se redibujan los cobradores cuyo dato o estilo cambió, y se borran las
+# gráficas de quienes ya no están en la plantilla.
+#
+# Con --tiempos imprime cuánto tardó cada etapa (con ONEPAGE_MEDICION=json
+# también se agrega al log de medicion.py).
+#
+# Uso: python Visuals.py [--workers N] [--forzar] [--tiempos]
 
+# Etiquetas y colores compartidos con las gráficas SVG (estilo_graficas.py)
+tipo_dictamen = list(COLUMNAS_DICTAMEN.values())
 
+tipo_pagocum = list(COLUMNAS_PAGOS.values())
 
-df.fillna(0, inplace=True)
-df = df.drop(["semana", "n_reestructuras"], axis=1)
+DPI = 400
 
-df["dictamen"] = df[["Promesas", "Vía de solución", "Negativa Fraude", "No localizado"]].values.tolist()
-df = df.drop(columns = ["Promesas", "Vía de solución", "Negativa Fraude", "No localizado"])
+# Subir cuando cambie el código de dibujo para invalidar todas las gráficas
+VERSION_GRAFICAS = 1
+TIPOS_GRAFICO = ["dictamen", "pagoscumpli"]
 
-df["pagos_cumplidos"] = df[["pago_parcial", "al_coriente", "liquidados", "monto_reestructuras"]].values.tolist()
-df = df.drop(columns = ["pago_parcial", "al_coriente", "liquidados", "monto_reestructuras"])
 
+def cargar_graficas(path):
+    df = leer_hoja(path, "graficas")
 
+    df.fillna(0, inplace=True)
+    df = df.drop(["n_reestructuras"], axis=1)
 
-tipo_dictamen = ["Promesas", "Vía de Solución", "Negativa Fraude", "No Localizada"]
+    df["dictamen"] = df[list(COLUMNAS_DICTAMEN)].values.tolist()
+    df = df.drop(columns = list(COLUMNAS_DICTAMEN))
 
-tipo_pagocum = ["Pago Parcial", "Al corriente", "Liquidación", "Reestructura"]
+    df["pagos_cumplidos"] = df[list(COLUMNAS_PAGOS)].values.tolist()
+    df = df.drop(columns = list(COLUMNAS_PAGOS))
+    return df
 
-def semana_label(fecha=None):
-    fecha = fecha or datetime.now()
-    iso_year, iso_week, _ = fecha.isocalendar()
-    semana = datetime.now().strftime("%Y%m%d")
-    return f"{iso_year}Sem{iso_week - 1:02d}"
 
-semana = semana_label()
+def nueva_figura():
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
 
-base_dir = f"D:/Cobranza/Streamlit/Resources/Visualizations/{semana}"
 
-os.makedirs(base_dir, exist_ok=True)
-
-# Colores y estilo
-texto_color = "white"
-barra_color_dictamen = "skyblue"
-
-for _, row in df.iterrows():
-    nombre = row["nombre"]
+def render_cobrador(cobrador, base_dir):
+    """Dibuja y guarda las dos gráficas de un cobrador: (nombre, dictamen, pagos_cumplidos)."""
+    nombre, dictamen, pagos_cumplidos = cobrador
     nombre_cobrador = nombre.replace(" ", "")
 
     # Gráfico de dictamen
-    fig, ax = plt.subplots(figsize=(6, 4))
-    ax.bar(tipo_dictamen, row["dictamen"], color=barra_color_dictamen)
+    fig, ax = nueva_figura()
+    ax.bar(tipo_dictamen, dictamen, color=barra_color_dictamen)
     ax.set_title("Dictamen", color=texto_color)
     ax.tick_params(colors=texto_color)
     ax.spines['bottom'].set_color(texto_color)
     ax.spines['left'].set_color(texto_color)
     ax.spines['top'].set_color('none')
     ax.spines['right'].set_color('none')
-    plt.xticks(rotation=20, ha="right", fontsize=12, color=texto_color)
-    plt.yticks(color=texto_color)
-    plt.tight_layout()
-    plt.savefig(f"{base_dir}/{nombre_cobrador}_dictamen.png", transparent = True, dpi = 400)
-    plt.close()
-
-    # Tabla de pagos cumplidos 
-    fig, ax = plt.subplots(figsize=(6, 4))
+    for etiqueta in ax.get_xticklabels():
+        etiqueta.set(rotation=20, ha="right", fontsize=12, color=texto_color)
+    for etiqueta in ax.get_yticklabels():
+        etiqueta.set(color=texto_color)
+    fig.tight_layout()
+    fig.savefig(f"{base_dir}/{nombre_cobrador}_dictamen.png", transparent = True, dpi = DPI)
+
+    # Tabla de pagos cumplidos
+    fig, ax = nueva_figura()
     ax.axis('off')
 
-    tabla_data = [[tipo_pagocum[i], row["pagos_cumplidos"][i]] for i in range(4)]
+    tabla_data = [[tipo_pagocum[i], pagos_cumplidos[i]] for i in range(4)]
     tabla = ax.table(cellText=tabla_data,
                      colWidths=[0.5, 0.5],
                      cellLoc='center',
@@ -75,5 +100,110 @@ for _, row in df.iterrows():
         cell.set_facecolor('none')
         cell.set_fontsize(14)
 
-    plt.savefig(f"{base_dir}/{nombre_cobrador}_pagoscumpli.png", transparent = True, dpi = 400)
-    plt.close()
+    fig.savefig(f"{base_dir}/{nombre_cobrador}_pagoscumpli.png", transparent = True, dpi = DPI)
+    return nombre
+
+
+def firma_estilo():
+    """Hash de todo lo que, además de los datos, cambia cómo se ve una gráfica."""
+    ajustes = [VERSION_GRAFICAS, tipo_dictamen, tipo_pagocum, texto_color, barra_color_dictamen, DPI]
+    return hashlib.sha256(json.dumps(ajustes).encode("utf-8")).hexdigest()
+
+
+def hash_cobrador(cobrador, estilo):
+    nombre, dictamen, pagos_cumplidos = cobrador
+    datos = json.dumps([nombre, list(dictamen), list(pagos_cumplidos), estilo], default=float)
+    return hashlib.sha256(datos.encode("utf-8")).hexdigest()
+
+
+def archivos_cobrador(nombre):
+    nombre_cobrador = nombre.replace(" ", "")
+    return [f"{nombre_cobrador}_{tipo}.png" for tipo in TIPOS_GRAFICO]
+
+
+def planear(cobradores, base_dir, manifiesto, forzar=False):
+    """
+    Compara la plantilla actual contra el manifiesto.
+
+    Devuelve: (pendientes, hashes, salientes) con los cobradores a redibujar,
+    el hash actual de cada uno y los nombres que ya no están en la plantilla.
+    """
+    estilo = firma_estilo()
+    previos = manifiesto.get("cobradores", {})
+    hashes, pendientes = {}, []
+    for cobrador in cobradores:
+        nombre = cobrador[0]
+        hashes[nombre] = hash_cobrador(cobrador, estilo)
+        completo = all(os.path.exists(os.path.join(base_dir, a)) for a in archivos_cobrador(nombre))
+        if forzar or not completo or previos.get(nombre, {}).get("hash") != hashes[nombre]:
+            pendientes.append(cobrador)
+    salientes = [nombre for nombre in previos if nombre not in hashes]
+    return pendientes, hashes, salientes
+
+
+def eliminar_salientes(base_dir, manifiesto, salientes):
+    for nombre in salientes:
+        for archivo in manifiesto["cobradores"][nombre].get("archivos", []):
+            try:
+                os.remove(os.path.join(base_dir, archivo))
+            except FileNotFoundError:
+                pass
+
+
+def render_todos(cobradores, base_dir, workers):
+    """Reparte los cobradores entre 'workers' procesos (1 = en el proceso actual)."""
+    tarea = partial(render_cobrador, base_dir=base_dir)
+    if workers <= 1:
+        return [tarea(c) for c in cobradores]
+    chunksize = max(1, len(cobradores) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(tarea, cobradores, chunksize=chunksize))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera las gráficas semanales de cada cobrador.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="procesos en paralelo (default: núcleos disponibles)")
+    parser.add_argument("--forzar", action="store_true",
+                        help="redibuja todos los cobradores aunque no hayan cambiado")
+    parser.add_argument("--tiempos", action="store_true", help="imprime el tiempo de cada etapa")
+    args = parser.parse_args()
+
+    medicion = Medicion(script="Visuals")
+    inicio = time.perf_counter()
+    with medicion.etapa("datos"):
+        df = cargar_graficas(CONFIG.libro)
+
+    # Carpeta de la semana de la hoja (semana_graficas), la misma que busca el dashboard
+    semana = semana_graficas(claves_semana(df).max())
+
+    base_dir = f"{CONFIG.visualizaciones}/{semana}"
+
+    os.makedirs(base_dir, exist_ok=True)
+
+    cobradores = list(zip(df["nombre"], df["dictamen"], df["pagos_cumplidos"]))
+    with medicion.etapa("plan") as detalle:
+        manifiesto = leer_manifiesto(base_dir)
+        pendientes, hashes, salientes = planear(cobradores, base_dir, manifiesto, forzar=args.forzar)
+        detalle["texto"] = f"{len(pendientes)} de {len(cobradores)} cobradores"
+
+    with medicion.etapa("dibujo") as detalle:
+        render_todos(pendientes, base_dir, args.workers)
+        detalle["texto"] = f"{2 * len(pendientes)} PNG, {args.workers} procesos"
+    with medicion.etapa("manifiesto"):
+        eliminar_salientes(base_dir, manifiesto, salientes)
+        escribir_manifiesto(base_dir, {
+            "estilo": firma_estilo(),
+            "cobradores": {
+                nombre: {"hash": h, "archivos": archivos_cobrador(nombre)}
+                for nombre, h in hashes.items()
+            },
+        })
+
+    total = time.perf_counter() - inicio
+    print(f"{len(pendientes)} redibujados, {len(cobradores) - len(pendientes)} sin cambios, "
+          f"{len(salientes)} eliminados ({args.workers} procesos): {total:.2f} s en total")
+    if args.tiempos:
+        medicion.imprimir()
+    if "json" in MODO_MEDICION:
+        medicion.escribir_json()
@@ -0,0 +1,241 @@
+# activos.py
+"""
+Caché de imágenes (fotos, logos y gráficas) codificadas en base64.
+
+Cada imagen se identifica con una llave de texto 'ruta::mtime_ns:tamaño', así
+que si el archivo cambia en disco la llave cambia sola. La llave se toma al
+momento de renderizar y el data URI se resuelve con un LRU acotado en memoria
+y, opcionalmente, una copia del blob ya codificado en disco para no volver a
+codificar en cada arranque en frío. En disco sólo queda la última versión de
+cada archivo, y podar() (lo llama precarga.py) borra los blobs de las imágenes
+que ya no se muestran.
+
+Alternativa sin base64: PublicadorEstatico copia cada imagen a la carpeta
+'static' de la app con un nombre derivado de su llave y devuelve la URL
+'app/static/...'. Así el navegador la descarga una vez y la reutiliza entre
+reruns y semanas (requiere server.enableStaticServing = true), y un proceso
+nuevo (o precarga.py) encuentra ya publicada la misma versión del archivo;
+podar() retira las que ya no se muestran.
+"""
+import base64
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+from configuracion import CONFIG
+
+FOTO_DEFAULT = "https://via.placeholder.com/72x72.png?text=Sin+Foto"
+# Blobs base64 ya codificados (CacheActivos) y carpeta 'static' de la app (PublicadorEstatico)
+CARPETA_CACHE_ACTIVOS = os.path.join(CONFIG.cache, "activos")
+CARPETA_STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+def clave_activo(path):
+    """Llave del archivo (ruta + mtime + tamaño); '' si no existe."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return f"{path}::{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def ruta_de_clave(clave):
+    return clave.rsplit("::", 1)[0]
+
+
+def codificar_imagen(path):
+    with open(path, "rb") as image_file:
+        encoded = base64.b64encode(image_file.read()).decode("utf-8")
+    return f"data:image/png;base64,{encoded}"
+
+
+class CacheActivos:
+    """
+    LRU de data URIs por llave de activo.
+
+    - max_items: número máximo de imágenes codificadas en memoria
+    - carpeta: si se indica, guarda ahí cada blob codificado (subcarpeta = hash de la
+      ruta, nombre = hash de la llave), sólo la última versión de cada archivo
+    """
+
+    def __init__(self, max_items=256, carpeta=None):
+        self.max_items = max_items
+        self.carpeta = carpeta
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        # aciertos en memoria / en disco, y fallos (se codificó el archivo)
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+
+    def _ruta_disco(self, clave):
+        # Una subcarpeta por archivo (hash de la ruta) con un blob por versión (hash de la llave)
+        ruta = hashlib.sha256(ruta_de_clave(clave).encode("utf-8")).hexdigest()[:32]
+        nombre = hashlib.sha256(clave.encode("utf-8")).hexdigest()
+        return os.path.join(self.carpeta, ruta, f"{nombre}.b64")
+
+    def _borrar_disco(self, conservar=frozenset(), carpetas=None):
+        """Borra los blobs que no están en 'conservar' (de 'carpetas' o de todas). Devuelve cuántos borró."""
+        if carpetas is None:
+            # También la carpeta raíz: blobs sueltos del formato anterior
+            carpetas = [entrada.path for entrada in os.scandir(self.carpeta) if entrada.is_dir()] + [self.carpeta]
+        borrados = 0
+        for carpeta in carpetas:
+            try:
+                entradas = list(os.scandir(carpeta))
+            except FileNotFoundError:
+                continue
+            for entrada in entradas:
+                if entrada.name.endswith(".b64") and entrada.path not in conservar:
+                    try:
+                        os.remove(entrada.path)
+                        borrados += 1
+                    except FileNotFoundError:
+                        pass
+            try:
+                os.rmdir(carpeta)  # sólo si quedó vacía
+            except OSError:
+                pass
+        return borrados
+
+    def _leer_disco(self, clave):
+        try:
+            with open(self._ruta_disco(clave), "r", encoding="ascii") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _escribir_disco(self, clave, uri):
+        ruta = self._ruta_disco(clave)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="ascii") as f:
+            f.write(uri)
+        os.replace(tmp, ruta)
+        # Las versiones anteriores del mismo archivo ya no se van a pedir
+        self._borrar_disco({ruta}, [os.path.dirname(ruta)])
+
+    def resolver(self, clave, default=FOTO_DEFAULT):
+        """Data URI de la llave; 'default' si la llave está vacía o el archivo ya no existe."""
+        if not clave:
+            return default
+        with self._lock:
+            uri = self._memoria.get(clave)
+            if uri is not None:
+                self.aciertos += 1
+                self._memoria.move_to_end(clave)
+                return uri
+
+        uri = self._leer_disco(clave) if self.carpeta else None
+        if uri is None:
+            try:
+                uri = codificar_imagen(ruta_de_clave(clave))
+            except FileNotFoundError:
+                return default
+            if self.carpeta:
+                self._escribir_disco(clave, uri)
+            with self._lock:
+                self.fallos += 1
+        else:
+            with self._lock:
+                self.aciertos_disco += 1
+
+        with self._lock:
+            self._memoria[clave] = uri
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.max_items:
+                self._memoria.popitem(last=False)
+        return uri
+
+    def invalidar(self, path=None):
+        """Saca de memoria y de disco las versiones de 'path' (todas las imágenes si no se indica)."""
+        with self._lock:
+            claves = [c for c in self._memoria if path is None or ruta_de_clave(c) == path]
+            for clave in claves:
+                del self._memoria[clave]
+        if self.carpeta:
+            self._borrar_disco(carpetas=None if path is None else [os.path.dirname(self._ruta_disco(f"{path}::"))])
+        return len(claves)
+
+    def podar(self, claves):
+        """Deja en disco sólo los blobs de 'claves' (las imágenes vigentes). Devuelve cuántos borró."""
+        if not self.carpeta:
+            return 0
+        return self._borrar_disco({self._ruta_disco(clave) for clave in claves if clave})
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "aciertos": self.aciertos,
+                "aciertos_disco": self.aciertos_disco,
+                "fallos": self.fallos,
+                "entradas": len(self._memoria),
+            }
+
+
+class PublicadorEstatico:
+    """
+    Publica imágenes en la carpeta 'static' de Streamlit con nombres por llave.
+
+    El nombre es el hash de la llave (ruta + mtime + tamaño), así que la URL sólo
+    cambia cuando cambia el archivo y el navegador puede conservarla en caché
+    (Streamlit responde con ETag/Last-Modified). Como el nombre se calcula sin
+    leer la imagen, si ya está en la carpeta no se vuelve a copiar: lo publicado
+    por precarga.py o por otro proceso sirve tal cual.
+    """
+
+    def __init__(self, carpeta_static, subcarpeta="img", prefijo_url="app/static"):
+        self.carpeta = os.path.join(carpeta_static, subcarpeta)
+        self.prefijo_url = f"{prefijo_url}/{subcarpeta}"
+        self._urls = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.carpeta, exist_ok=True)
+
+    def nombre(self, clave):
+        """Archivo publicado de la llave: hash de la llave + extensión del original."""
+        extension = os.path.splitext(ruta_de_clave(clave))[1].lower()
+        return hashlib.sha256(clave.encode("utf-8")).hexdigest()[:32] + extension
+
+    def _publicar(self, clave):
+        nombre = self.nombre(clave)
+        destino = os.path.join(self.carpeta, nombre)
+        if not os.path.exists(destino):
+            # Copia (no enlace duro): si la foto se reescribe en su lugar, lo publicado no cambia
+            tmp = os.path.join(self.carpeta, f".{os.getpid()}.{threading.get_ident()}.tmp")
+            shutil.copyfile(ruta_de_clave(clave), tmp)
+            os.replace(tmp, destino)
+        return f"{self.prefijo_url}/{nombre}"
+
+    def url(self, clave, default=FOTO_DEFAULT):
+        """URL estática de la llave; 'default' si la llave está vacía o el archivo ya no existe."""
+        if not clave:
+            return default
+        with self._lock:
+            url = self._urls.get(clave)
+        if url is None:
+            try:
+                url = self._publicar(clave)
+            except FileNotFoundError:
+                return default
+            with self._lock:
+                self._urls[clave] = url
+        return url
+
+    def podar(self, claves):
+        """Deja en la carpeta sólo las imágenes de 'claves' (las vigentes). Devuelve cuántas borró."""
+        vigentes = {self.nombre(clave) for clave in claves if clave}
+        borradas = 0
+        for nombre in os.listdir(self.carpeta):
+            if nombre not in vigentes:
+                try:
+                    os.remove(os.path.join(self.carpeta, nombre))
+                    borradas += 1
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            self._urls = {clave: url for clave, url in self._urls.items() if url.rsplit("/", 1)[1] in vigentes}
+        return borradas
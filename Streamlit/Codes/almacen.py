@@ -0,0 +1,213 @@
+# almacen.py
+"""
+Almacén local de varias semanas, particionado por año y semana en Parquet.
+
+Cada archivo semanal (op_sl_semNN.xlsx o one_page_semNN.csv) se agrega al
+almacén escribiendo una partición por semana y por hoja:
+
+    almacen/one_page/anio=2025/semana=43/datos.parquet
+    almacen/graficas/anio=2025/semana=43/datos.parquet
+
+El año de cada semana se fija al ingerir (ingesta.agregar_anio: columna
+'anio', año en el nombre, fecha del libro o --anio), así que la semana 43 de
+2026 no pisa a la de 2025. Las semanas se ordenan y se piden por su clave
+anio * 100 + semana (esquema.clave_semana).
+
+La ingesta sólo agrega: si la semana ya existe se conserva (salvo con
+--reemplazar). El dashboard lista las particiones y lee únicamente las
+semanas que muestra, así que el tiempo de carga no crece con el historial.
+
+Uso:
+    python almacen.py D:/Cobranza/Streamlit/Resources/Data/op_sl_sem43.xlsx [--anio 2025] [--reemplazar]
+    python almacen.py --migrar 2025    # particiones semana=N anteriores -> anio=2025/semana=N
+"""
+import argparse
+import os
+import shutil
+
+import pandas as pd
+
+from configuracion import CONFIG
+from esquema import clave_semana, etiqueta_semana
+from ingesta import HOJAS, agregar_anio, anios_semanas, leer_hoja, tipar_texto, ultima_semana
+
+CARPETA_ALMACEN = CONFIG.almacen
+ARCHIVO_PARTICION = "datos.parquet"
+
+
+def leer_archivo_semanal(path, anio=None):
+    """
+    Hojas del archivo semanal con la columna 'anio': el .xlsx trae 'one_page' y
+    'graficas'; el .csv sólo 'one_page'. 'anio' fija el año de la última semana.
+    """
+    if path.lower().endswith(".csv"):
+        try:
+            df = pd.read_csv(path)
+        except UnicodeDecodeError:
+            df = pd.read_csv(path, encoding="latin-1")
+        return {"one_page": agregar_anio(tipar_texto(df), path, anio)}
+    return {hoja: agregar_anio(leer_hoja(path, hoja), path, anio) for hoja in HOJAS}
+
+
+def _carpeta_particion(carpeta, hoja, anio, semana):
+    return os.path.join(carpeta, hoja, f"anio={int(anio)}", f"semana={int(semana)}")
+
+
+def _escribir_particion(filas, destino):
+    # Se escribe en una carpeta temporal y se renombra: nunca queda una partición a medias
+    tmp = destino + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    filas.reset_index(drop=True).to_parquet(os.path.join(tmp, ARCHIVO_PARTICION), index=False)
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(tmp, destino)
+
+
+def agregar_archivo(path, carpeta=CARPETA_ALMACEN, reemplazar=False, anio=None):
+    """
+    Agrega las semanas del archivo al almacén.
+
+    Devuelve: dict hoja -> (claves agregadas, claves que ya existían y se omitieron)
+    """
+    resultado = {}
+    for hoja, df in leer_archivo_semanal(path, anio).items():
+        agregadas, omitidas = [], []
+        for (anio_semana, semana), filas in df.groupby(["anio", "semana"], sort=True):
+            clave = clave_semana(anio_semana, semana)
+            destino = _carpeta_particion(carpeta, hoja, anio_semana, semana)
+            if os.path.exists(os.path.join(destino, ARCHIVO_PARTICION)) and not reemplazar:
+                omitidas.append(clave)
+                continue
+            _escribir_particion(filas, destino)
+            agregadas.append(clave)
+        resultado[hoja] = (agregadas, omitidas)
+    return resultado
+
+
+def migrar_particiones(carpeta=CARPETA_ALMACEN, anio=None):
+    """
+    Pasa las particiones sin año (hoja/semana=N, del formato anterior) a
+    hoja/anio=A/semana=N. 'anio' es el año de la última semana del almacén; si
+    las semanas cruzan el fin de año, las altas quedan en el anterior.
+
+    Devuelve: dict hoja -> claves migradas (en orden de clave)
+    """
+    resultado = {}
+    for hoja in HOJAS:
+        carpeta_hoja = os.path.join(carpeta, hoja)
+        viejas = {}
+        if os.path.isdir(carpeta_hoja):
+            for nombre in os.listdir(carpeta_hoja):
+                ruta = os.path.join(carpeta_hoja, nombre, ARCHIVO_PARTICION)
+                if nombre.startswith("semana=") and not nombre.endswith(".tmp") and os.path.exists(ruta):
+                    viejas[int(nombre.split("=", 1)[1])] = ruta
+        if not viejas:
+            continue
+        semanas = sorted(viejas)
+        anios = anios_semanas(semanas, int(anio), ultima_semana(semanas))
+        migradas = []
+        for semana, anio_semana in zip(semanas, anios.tolist()):
+            filas = pd.read_parquet(viejas[semana]).assign(anio=anio_semana)
+            _escribir_particion(filas, _carpeta_particion(carpeta, hoja, anio_semana, semana))
+            shutil.rmtree(os.path.dirname(viejas[semana]))
+            migradas.append(clave_semana(anio_semana, semana))
+        resultado[hoja] = sorted(migradas)
+    return resultado
+
+
+class AlmacenSemanal:
+    """
+    Lectura por rango de semanas sobre el almacén particionado.
+
+    Misma interfaz que indices.IndiceSemanas (semanas, ultimas, rango), pero
+    'rango' sólo abre las particiones pedidas. Las semanas son claves
+    anio * 100 + semana. 'preparar' se aplica a las filas leídas (por ejemplo,
+    las transformaciones de load_data).
+    """
+
+    def __init__(self, carpeta=CARPETA_ALMACEN, hoja="one_page", preparar=None):
+        self.carpeta = os.path.join(carpeta, hoja)
+        self.preparar = preparar
+
+    def _carpetas_anio(self):
+        try:
+            nombres = os.listdir(self.carpeta)
+        except FileNotFoundError:
+            return []
+        if any(nombre.startswith("semana=") for nombre in nombres):
+            raise RuntimeError(
+                f"{self.carpeta} tiene particiones sin año (semana=N); "
+                "páselas a anio=AAAA/semana=N con: python almacen.py --migrar AAAA"
+            )
+        return sorted(
+            os.path.join(self.carpeta, nombre) for nombre in nombres
+            if nombre.startswith("anio=") and not nombre.endswith(".tmp")
+        )
+
+    def _particiones(self):
+        """Clave -> archivo de cada partición completa, en orden de clave."""
+        particiones = {}
+        for carpeta_anio in self._carpetas_anio():
+            anio = int(os.path.basename(carpeta_anio).split("=", 1)[1])
+            for nombre in os.listdir(carpeta_anio):
+                if nombre.startswith("semana=") and not nombre.endswith(".tmp"):
+                    ruta = os.path.join(carpeta_anio, nombre, ARCHIVO_PARTICION)
+                    if os.path.exists(ruta):
+                        particiones[clave_semana(anio, nombre.split("=", 1)[1])] = ruta
+        return dict(sorted(particiones.items()))
+
+    @property
+    def semanas(self):
+        return list(self._particiones())
+
+    def _archivos(self, desde, hasta):
+        return [ruta for clave, ruta in self._particiones().items() if desde <= clave <= hasta]
+
+    def carpetas(self):
+        """La carpeta de la hoja y las de cada año: cambian cuando se agrega una semana."""
+        return [self.carpeta] + self._carpetas_anio()
+
+    def fuentes(self, desde, hasta):
+        """Archivos de los que depende el rango (su huella invalida los cachés, ver huellas.py)."""
+        return self.carpetas() + self._archivos(desde, hasta)
+
+    def ultimas(self, n):
+        semanas = self.semanas
+        if not semanas:
+            return None, None
+        return semanas[-n:][0], semanas[-1]
+
+    def rango(self, desde, hasta):
+        """Filas de las semanas desde..hasta (claves), leyendo sólo esas particiones (en orden de clave)."""
+        archivos = self._archivos(desde, hasta)
+        if not archivos:
+            return pd.DataFrame()
+        df = pd.concat([pd.read_parquet(ruta) for ruta in archivos], ignore_index=True)
+        return self.preparar(df) if self.preparar else df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agrega archivos semanales al almacén particionado por año y semana.")
+    parser.add_argument("archivos", nargs="*", help="op_sl_semNN.xlsx o one_page_semNN.csv")
+    parser.add_argument("--almacen", default=CARPETA_ALMACEN, help="carpeta del almacén")
+    parser.add_argument("--anio", type=int, default=None,
+                        help="año de la última semana de los archivos (default: columna 'anio', nombre o fecha del libro)")
+    parser.add_argument("--reemplazar", action="store_true",
+                        help="sobrescribe las semanas que ya existan en el almacén")
+    parser.add_argument("--migrar", type=int, metavar="ANIO", default=None,
+                        help="pasa las particiones semana=N sin año a anio=ANIO/semana=N")
+    args = parser.parse_args()
+    if not args.archivos and args.migrar is None:
+        parser.error("indique archivos o --migrar ANIO")
+
+    if args.migrar is not None:
+        for hoja, migradas in migrar_particiones(args.almacen, args.migrar).items():
+            print(f"[{hoja}]: {len(migradas)} semanas migradas {[etiqueta_semana(c) for c in migradas]}")
+    for archivo in args.archivos:
+        try:
+            resultado = agregar_archivo(archivo, args.almacen, args.reemplazar, args.anio)
+        except ValueError as error:
+            raise SystemExit(str(error))
+        for hoja, (agregadas, omitidas) in resultado.items():
+            print(f"{archivo} [{hoja}]: {len(agregadas)} semanas agregadas {[etiqueta_semana(c) for c in agregadas]}, "
+                  f"{len(omitidas)} ya existían {[etiqueta_semana(c) for c in omitidas]}")
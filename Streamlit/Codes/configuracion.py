@@ -0,0 +1,119 @@
+# configuracion.py
+"""
+Configuración del One Page: carpetas de recursos, semana activa y modos.
+
+Cada ajuste se toma, en este orden de prioridad, de:
+
+1. la variable de entorno ONEPAGE_<AJUSTE> (p. ej. ONEPAGE_RAIZ, ONEPAGE_FOTOS,
+   ONEPAGE_MODO_IMAGENES)
+2. el archivo TOML de ONEPAGE_CONFIG (si se indica, tiene que existir) o, si
+   no se indica, onepage.toml junto a este módulo, que es opcional (ver
+   onepage.ejemplo.toml)
+3. los valores por defecto: la carpeta Streamlit que contiene estos códigos
+   (en producción, D:/Cobranza/Streamlit)
+
+Los valores por defecto de las carpetas se derivan de 'raiz' y 'recursos', así
+que basta con mover la raíz (o sólo los recursos, p. ej. a un SSD o tmpfs)
+para que todo lo demás la siga. En el archivo y en el entorno las rutas
+relativas se toman respecto de 'raiz', y se puede escribir {raiz} o
+{recursos} dentro de un valor.
+"""
+import os
+import re
+from collections import namedtuple
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+PREFIJO_ENTORNO = "ONEPAGE_"
+CARPETA_CODIGOS = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_CONFIG = os.path.join(CARPETA_CODIGOS, "onepage.toml")
+# Raíz por defecto: la carpeta padre de Codes (la que tiene Resources)
+RAIZ_INSTALACION = os.path.dirname(CARPETA_CODIGOS).replace("\\", "/")
+
+# Ajuste -> valor por defecto; las rutas pueden usar los ajustes anteriores entre llaves
+AJUSTES = {
+    # Carpetas
+    "raiz": RAIZ_INSTALACION,
+    "recursos": "{raiz}/Resources",
+    "libro": "{recursos}/Data/op_sl_sem43.xlsx",
+    "almacen": "{recursos}/Data/almacen",
+    "fotos": "{recursos}/Photos",
+    "visualizaciones": "{recursos}/Visualizations",
+    "css": "{recursos}/CSS/estilos.css",
+    "logo": "{recursos}/Logos/Logo_Fincomun.png",
+    "plantillas": "{recursos}/Templates",
+    "cache": "{recursos}/.cache",
+    "salida_html": "{raiz}/HTMLs",
+    "salida_tarjetas": "{raiz}/Tarjetas",
+    "resultados": "{raiz}/Benchmarks",
+    # Carpeta de gráficas PNG fija (p. ej. 2025Sem43); vacío = la de la semana de los datos
+    "semana": "",
+    # Año de la última semana de los archivos que no lo dicen (sin columna 'anio', sin año en
+    # el nombre ni fecha del libro, p. ej. un .csv); ver ingesta.agregar_anio
+    "anio": "",
+    # Modos
+    "modo_imagenes": "base64",
+    "modo_graficos": "png",
+    "backend": "pandas",
+    "medicion": "",
+    "navegador": "",
+}
+RUTAS = [
+    "raiz", "recursos", "libro", "almacen", "fotos", "visualizaciones", "css", "logo", "plantillas", "cache",
+    "salida_html", "salida_tarjetas", "resultados",
+]
+
+Configuracion = namedtuple("Configuracion", list(AJUSTES))
+
+
+def _es_absoluta(ruta):
+    # 'D:/...' también cuenta como absoluta aunque se corra en Linux
+    return os.path.isabs(ruta) or re.match(r"^[A-Za-z]:[/\\]", ruta) is not None
+
+
+def leer_archivo(ruta, obligatorio=False):
+    """Ajustes del archivo TOML; si no existe, vacío o FileNotFoundError si es 'obligatorio'."""
+    if not os.path.exists(ruta):
+        if obligatorio:
+            raise FileNotFoundError(f"No existe el archivo de configuración indicado: {ruta}")
+        return {}
+    if tomllib is None:
+        raise RuntimeError(f"Para leer {ruta} se necesita Python 3.11+ o el paquete tomli")
+    with open(ruta, "rb") as f:
+        datos = tomllib.load(f)
+    desconocidos = set(datos) - set(AJUSTES)
+    if desconocidos:
+        raise ValueError(f"{ruta}: ajustes desconocidos {sorted(desconocidos)}")
+    return {clave: str(valor) for clave, valor in datos.items()}
+
+
+def cargar_configuracion(ruta=None, entorno=None):
+    """Configuración con los valores por defecto, el archivo y el entorno (en ese orden de prioridad)."""
+    entorno = os.environ if entorno is None else entorno
+    # Un archivo indicado a mano tiene que existir: un error de tipeo no debe correr con los defaults
+    ruta = ruta or entorno.get(f"{PREFIJO_ENTORNO}CONFIG")
+    explicitos = leer_archivo(ruta, obligatorio=True) if ruta else leer_archivo(ARCHIVO_CONFIG)
+    for clave in AJUSTES:
+        valor = entorno.get(PREFIJO_ENTORNO + clave.upper())
+        if valor is not None:
+            explicitos[clave] = valor
+
+    valores = {}
+    for clave, defecto in AJUSTES.items():
+        valor = explicitos.get(clave, defecto)
+        if clave in RUTAS:
+            valor = valor.format(**valores)
+            # Las rutas relativas dadas en el archivo o el entorno cuelgan de la raíz
+            if clave != "raiz" and clave in explicitos and not _es_absoluta(valor):
+                valor = f"{valores['raiz']}/{valor}"
+        valores[clave] = valor
+    return Configuracion(**valores)
+
+
+CONFIG = cargar_configuracion()
@@ -0,0 +1,84 @@
+# consultas.py
+"""
+Backend SQL opcional (DuckDB) para las agregaciones del dashboard.
+
+En lugar de cargar las filas en pandas y agregarlas ahí, los promedios por
+cobrador, la última plantilla_general y el ranking se calculan con SQL
+directamente sobre las particiones Parquet del almacén (almacen.py). Las
+semanas disponibles salen de AlmacenSemanal, que sólo lista las carpetas.
+A pandas sólo llegan los promedios (una fila por cobrador) y las filas
+semanales del rango; el perfil de la primera semana del rango
+(tarjetas.perfil_del_rango) se une con tarjetas.completar_resumen, así que
+el resultado tiene la misma forma que tarjetas.construir_datos_tarjetas y el
+resto del render no cambia.
+
+Si duckdb no está instalado, DUCKDB_DISPONIBLE es False y el dashboard sigue
+con pandas.
+"""
+import os
+
+import pandas as pd
+
+from tarjetas import COLUMNAS_PROMEDIO, completar_resumen, perfil_del_rango
+
+try:
+    import duckdb
+    DUCKDB_DISPONIBLE = True
+except ImportError:
+    duckdb = None
+    DUCKDB_DISPONIBLE = False
+
+# Columna del dashboard -> columna cruda en el almacén
+COLUMNAS_ORIGEN = {"logros_meta": "meta"}
+# Clave ordenable de la semana (esquema.clave_semana)
+CLAVE = "(anio * 100 + semana)"
+
+
+def _origen(carpeta_almacen):
+    patron = os.path.join(carpeta_almacen, "one_page", "anio=*", "semana=*", "datos.parquet").replace("\\", "/")
+    patron = patron.replace("'", "''")
+    return f"read_parquet('{patron}', hive_partitioning = true, union_by_name = true)"
+
+
+def agregados_tarjetas(carpeta_almacen, desde, hasta, preparar):
+    """
+    (semanal, resumen) del rango de semanas (claves desde..hasta) calculados en DuckDB.
+
+    - preparar: convierte las filas leídas en esquema.Datos (el preparar_datos de load_data)
+    - semanal: hechos del rango ordenados por nombre, año y semana
+    - resumen: como tarjetas.completar_resumen; los promedios toman los nulos
+      como 0, igual que load_data.
+    """
+    origen = _origen(carpeta_almacen)
+    promedios = ",\n            ".join(
+        f"favg(coalesce({COLUMNAS_ORIGEN.get(col, col)}, 0) ORDER BY {CLAVE}) AS {col}" for col in COLUMNAS_PROMEDIO
+    )
+    consulta_resumen = f"""
+        SELECT
+            nombre,
+            {promedios},
+            arg_max(coalesce(plantilla_general, 0), {CLAVE}) AS plantilla,
+            count(*) AS filas
+        FROM {origen}
+        WHERE {CLAVE} BETWEEN $desde AND $hasta
+        GROUP BY nombre
+        ORDER BY nombre
+    """
+    consulta_semanal = f"""
+        SELECT *
+        FROM {origen}
+        WHERE {CLAVE} BETWEEN $desde AND $hasta
+        ORDER BY nombre, anio, semana
+    """
+    parametros = {"desde": int(desde), "hasta": int(hasta)}
+    with duckdb.connect() as con:
+        promedios = con.execute(consulta_resumen, parametros).df()
+        filas = con.execute(consulta_semanal, parametros).df()
+
+    cobradores, semanal = preparar(filas)
+    # Mismo orden que los hechos (cobrador_id sigue el orden alfabético del nombre)
+    ids = pd.Series(cobradores.index, index=cobradores["nombre"])
+    promedios.index = pd.Index(ids.loc[promedios["nombre"]].to_numpy(), name="cobrador_id")
+    tamanos = promedios.pop("filas")
+    promedios = promedios.drop(columns="nombre").join(perfil_del_rango(semanal))
+    return semanal.reset_index(drop=True), completar_resumen(promedios, tamanos, cobradores)
@@ -0,0 +1,157 @@
+# esquema.py
+"""
+Modelo y esquema compacto de los datos 'one_page'.
+
+La hoja trae una fila por cobrador y semana, repitiendo en cada una los datos
+del cobrador (nombre, zona, experiencia, motos). normalizar la separa en:
+
+- cobradores: tabla de dimensión, una fila por cobrador, indexada por
+  'cobrador_id' (entero). Aquí viven el nombre y la ruta de la foto, que
+  se calculan una sola vez por cobrador.
+- hechos: tabla semanal delgada con 'cobrador_id', 'anio', 'semana', las
+  métricas y el perfil de esa semana (zona, experiencia y motos como
+  categorías). El perfil que muestra la tarjeta es el de la primera semana
+  del rango mostrado (tarjetas.perfil_del_rango), no el de la primera
+  semana cargada, así que un cambio de zona se ve igual con cualquier
+  backend.
+
+'cobrador_id' es el código del nombre en orden alfabético, así que ordenar
+los hechos por id equivale a ordenarlos por nombre.
+
+La hoja sólo trae el número de semana; el año lo agrega la ingesta
+(ingesta.agregar_anio). Las semanas se identifican con una clave ordenable
+anio * 100 + semana (202543), que es la que usan los rangos, el almacén y los
+filtros del dashboard; etiqueta_semana la muestra como '2025Sem43'.
+
+aplicar_esquema convierte ambas tablas a tipos compactos (categorías y enteros
+chicos). Los porcentajes 0–1 y los montos se quedan en float64: son cocientes
+con todos sus decimales y en float32 cambiaría el redondeo de lo que se
+muestra (0.0165 -> 1.6% en lugar de 1.7%). validar revisa la hoja antes de
+separar: si falta una columna, si un conteo trae decimales o si un valor no
+cabe en el tipo, se lanza ValueError con todos los problemas encontrados en
+lugar de truncar en silencio.
+"""
+from collections import namedtuple
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Tablas que devuelven load_data y AlmacenSemanal.rango
+Datos = namedtuple("Datos", ["cobradores", "hechos"])
+
+# Perfil del cobrador: puede cambiar de una semana a otra
+COLUMNAS_PERFIL = ["zona", "experiencia", "motos"]
+
+ENTEROS = {
+    "anio": "int16",
+    "semana": "int16",
+    "plantilla_general": "int16",
+    "visitas": "int32",
+    "visitas_totales": "int32",
+}
+PORCENTAJES = ["plantilla", "contacto", "promesas_contacto", "promesas_cumplidas", "logros_meta"]
+REALES = ["horas_visita", "segundos", "monto"]
+
+ESQUEMA_PERFIL = {
+    "zona": "category",
+    "experiencia": "category",
+    "motos": "category",
+}
+ESQUEMA_HECHOS = {
+    "cobrador_id": "int32",
+    **ENTEROS,
+    **ESQUEMA_PERFIL,
+    **{col: "float64" for col in PORCENTAJES + REALES},
+}
+
+# Columnas sin las que no se puede armar una tarjeta
+OBLIGATORIAS = ["nombre", "zona", "anio", "semana", "logros_meta"]
+
+
+# ---------- Semanas ----------
+def clave_semana(anio, semana):
+    """Clave ordenable de una semana: (2025, 43) -> 202543."""
+    return int(anio) * 100 + int(semana)
+
+
+def claves_semana(df):
+    """Clave de cada fila de una tabla con columnas 'anio' y 'semana' (arreglo int32)."""
+    return df["anio"].to_numpy(dtype=np.int32) * 100 + df["semana"].to_numpy(dtype=np.int32)
+
+
+def etiqueta_semana(clave):
+    """202543 -> '2025Sem43' (carpetas de Visualizations, filtros y nombres de las exportaciones)."""
+    anio, semana = divmod(int(clave), 100)
+    return f"{anio}Sem{semana:02d}"
+
+
+def leer_semana(texto, claves=()):
+    """
+    Clave de una semana escrita a mano: '2025Sem43', '2025-W43' o '202543'.
+
+    Sólo el número ('43') se toma como la semana 43 más reciente de 'claves';
+    lanza ValueError si no se reconoce o no está.
+    """
+    texto = str(texto).strip()
+    completa = re.fullmatch(r"(\d{4})\s*(?:sem|-?w)?\s*(\d{1,2})", texto, flags=re.I)
+    if completa:
+        return clave_semana(*completa.groups())
+    if texto.isdigit():
+        semana = int(texto)
+        candidatas = [clave for clave in claves if clave % 100 == semana]
+        if candidatas:
+            return max(candidatas)
+    raise ValueError(f"Semana no reconocida o sin datos: {texto!r} (p. ej. 2025Sem43, 2025-W43 o 43)")
+
+
+def validar(df):
+    """Lista de problemas de la hoja frente al esquema (vacía si es válida)."""
+    problemas = [f"falta la columna '{col}'" for col in OBLIGATORIAS if col not in df.columns]
+    for col, tipo in ENTEROS.items():
+        if col not in df.columns:
+            continue
+        valores = pd.to_numeric(df[col], errors="coerce")
+        if valores.isna().any():
+            problemas.append(f"'{col}' tiene valores vacíos o no numéricos")
+            continue
+        limites = np.iinfo(tipo)
+        if (valores % 1 != 0).any():
+            problemas.append(f"'{col}' tiene valores con decimales")
+        elif valores.min() < limites.min or valores.max() > limites.max:
+            problemas.append(f"'{col}' tiene valores fuera del rango de {tipo}")
+    for col in PORCENTAJES + REALES:
+        if col in df.columns and pd.to_numeric(df[col], errors="coerce").isna().any():
+            problemas.append(f"'{col}' tiene valores vacíos o no numéricos")
+    # La clave anio * 100 + semana supone semanas ISO
+    if "semana" in df.columns and not pd.to_numeric(df["semana"], errors="coerce").fillna(1).between(1, 53).all():
+        problemas.append("'semana' tiene valores fuera de 1–53")
+    return problemas
+
+
+def normalizar(df):
+    """
+    Valida la hoja y la separa en Datos(cobradores, hechos) (sin convertir tipos).
+
+    Lanza ValueError si la hoja no cumple el esquema.
+    """
+    problemas = validar(df)
+    if problemas:
+        raise ValueError("Datos 'one_page' inválidos: " + "; ".join(problemas))
+    nombres = pd.Categorical(df["nombre"])
+    ids = pd.Series(nombres.codes, index=df.index, name="cobrador_id")
+    cobradores = pd.DataFrame(
+        {"nombre": nombres.categories},
+        index=pd.RangeIndex(len(nombres.categories), name="cobrador_id"),
+    )
+
+    hechos = df.drop(columns="nombre")
+    hechos.insert(0, "cobrador_id", ids)
+    return Datos(cobradores, hechos)
+
+
+def aplicar_esquema(datos):
+    """Convierte las columnas presentes de los hechos a sus tipos compactos (cobradores sólo tiene texto)."""
+    cobradores, hechos = datos
+    return Datos(cobradores, hechos.astype({c: t for c, t in ESQUEMA_HECHOS.items() if c in hechos.columns}))
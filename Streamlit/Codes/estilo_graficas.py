@@ -0,0 +1,27 @@
+# estilo_graficas.py
+"""
+Etiquetas y colores de las gráficas de la tarjeta.
+
+Los usan los PNG de Visuals.py y los SVG de graficos_svg.py, así que las dos
+formas de dibujar se ven igual. Como forman parte de Visuals.firma_estilo,
+cambiar un color o una etiqueta aquí hace que se redibujen los PNG en la
+siguiente corrida; el SVG lo toma en cuanto se reinicia el dashboard.
+"""
+
+# columna de la hoja 'graficas' -> etiqueta mostrada, en el orden de las barras y filas
+COLUMNAS_DICTAMEN = {
+    "Promesas": "Promesas",
+    "Vía de solución": "Vía de Solución",
+    "Negativa Fraude": "Negativa Fraude",
+    "No localizado": "No Localizada",
+}
+COLUMNAS_PAGOS = {
+    "pago_parcial": "Pago Parcial",
+    "al_coriente": "Al corriente",
+    "liquidados": "Liquidación",
+    "monto_reestructuras": "Reestructura",
+}
+
+# Colores y estilo
+texto_color = "white"
+barra_color_dictamen = "skyblue"
@@ -0,0 +1,153 @@
+# exportar_html.py
+"""
+Exportador del reporte One Page a HTML estático, sin levantar Streamlit.
+
+Usa el mismo código que el dashboard (preparación, agregados, tarjeta.html y
+macros, estilos.css y el header) y escribe un solo archivo autocontenido por
+semana: fotos, logo y gráficas van como data URI. Opcionalmente se genera un
+archivo por zona. El HTML se minifica (sin comentarios CSS ni sangrías).
+
+Uso:
+    python exportar_html.py [--libro RUTA] [--desde 2025Sem40 --hasta 2025Sem43] [--graficas png|svg]
+                            [--semana-graficas 2025Sem43] [--por-zona] [--salida CARPETA]
+"""
+import argparse
+import os
+import re
+import time
+from collections import namedtuple
+
+from activos import CARPETA_CACHE_ACTIVOS, CacheActivos, clave_activo
+from configuracion import CONFIG
+from esquema import etiqueta_semana, leer_semana
+from graficos_svg import graficos_por_cobrador, llave_cobrador
+from pagina import RUTA_LOGO, encabezado_html, estilos_css, html_graficos_png, tarjetas_html
+from preparacion import RUTA_LIBRO, abrir_indice, hoja_graficas, rutas_visualizaciones, semana_graficas
+from tarjetas import CARPETA_PLANTILLAS, construir_datos_tarjetas, entorno_plantillas
+
+CARPETA_SALIDA = CONFIG.salida_html
+TITULO = "One Page - Cobranza"
+
+
+def minificar_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).strip()
+
+
+def minificar_html(html):
+    """Quita los comentarios CSS, las sangrías entre etiquetas y los espacios repetidos."""
+    html = re.sub(r"<style>(.*?)</style>", lambda m: f"<style>{minificar_css(m.group(1))}</style>", html, flags=re.S)
+    html = re.sub(r">\s*\n\s*<", "><", html)
+    return re.sub(r"\s{2,}", " ", html)
+
+
+def nombre_archivo(semana, zona=None):
+    nombre = f"{TITULO} {etiqueta_semana(semana)}" + (f" - {zona}" if zona else "")
+    return re.sub(r'[<>:"/\\|?*]', "", nombre) + ".html"
+
+
+# Lo que necesita cualquier exportación: datos del rango, plantillas y resolución de imágenes
+Contexto = namedtuple("Contexto", [
+    "desde", "hasta", "semanal", "resumen", "entorno", "plantilla", "url_imagen", "visualizaciones", "css",
+])
+
+
+def preparar_contexto(ruta_libro=RUTA_LIBRO, desde=None, hasta=None, graficas="png", carpeta_graficas=None):
+    """
+    Datos y funciones de render del rango (por defecto, las últimas 4 semanas).
+
+    'desde' y 'hasta' son claves (202543) o texto como '2025Sem43' o '43' (ver
+    esquema.leer_semana). Las gráficas PNG se toman de carpeta_graficas
+    (default: la de la semana 'hasta').
+    """
+    indice = abrir_indice(ruta_libro)
+    ultima_desde, ultima_hasta = indice.ultimas(4)
+    desde = ultima_desde if desde is None else leer_semana(desde, indice.semanas)
+    hasta = ultima_hasta if hasta is None else leer_semana(hasta, indice.semanas)
+    semanal, resumen = construir_datos_tarjetas(indice.rango(desde, hasta))
+
+    entorno = entorno_plantillas(CARPETA_PLANTILLAS)
+    activos = CacheActivos(max_items=64, carpeta=CARPETA_CACHE_ACTIVOS)
+
+    # Sin foto no se pone el placeholder externo: la tarjeta muestra la inicial
+    def url_imagen(clave):
+        return activos.resolver(clave, default="")
+
+    if graficas == "svg":
+        svgs = graficos_por_cobrador(hoja_graficas(ruta_libro, hasta))
+
+        def visualizaciones(cobrador):
+            return svgs.get(llave_cobrador(cobrador.Index), "")
+    else:
+        carpeta_graficas = carpeta_graficas or semana_graficas(hasta)
+
+        def visualizaciones(cobrador):
+            return html_graficos_png(rutas_visualizaciones(cobrador.nombre_junto, carpeta_graficas), url_imagen)
+
+    return Contexto(desde, hasta, semanal, resumen, entorno, entorno.get_template("tarjeta.html"),
+                    url_imagen, visualizaciones, estilos_css())
+
+
+def pagina_html(contexto, titulo, tarjetas, encabezado="", subtitulo=""):
+    """Documento completo y minificado (reporte.html) con las tarjetas dadas."""
+    html = contexto.entorno.get_template("reporte.html").render(
+        titulo=titulo, css=contexto.css, encabezado=encabezado, subtitulo=subtitulo, tarjetas=tarjetas,
+    )
+    return minificar_html(html)
+
+
+def escribir(ruta, contenido):
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        f.write(contenido)
+    os.replace(ruta + ".tmp", ruta)
+
+
+def exportar(ruta_libro=RUTA_LIBRO, desde=None, hasta=None, graficas="png", carpeta_graficas=None,
+             por_zona=False, salida=CARPETA_SALIDA):
+    """Escribe el reporte (o uno por zona). Devuelve la lista de (ruta, cobradores, bytes)."""
+    ctx = preparar_contexto(ruta_libro, desde, hasta, graficas, carpeta_graficas)
+    encabezado = encabezado_html(ctx.entorno, ctx.url_imagen(clave_activo(RUTA_LOGO)))
+
+    partes = [(None, ctx.resumen)]
+    if por_zona:
+        partes = [(str(zona), filas) for zona, filas in ctx.resumen.groupby("zona", observed=True, sort=True)]
+
+    os.makedirs(salida, exist_ok=True)
+    escritos = []
+    for zona, filas in partes:
+        html = pagina_html(
+            ctx,
+            titulo=f"{TITULO} {etiqueta_semana(ctx.hasta)}" + (f" - {zona}" if zona else ""),
+            tarjetas=tarjetas_html(ctx.plantilla, ctx.semanal, filas, 0, len(filas), ctx.url_imagen, ctx.visualizaciones),
+            encabezado=encabezado,
+            subtitulo=f"Semanas {etiqueta_semana(ctx.desde)} a {etiqueta_semana(ctx.hasta)}"
+            + (f" · Zona: {zona}" if zona else "")
+            + f" · {len(filas)} coordinadores",
+        )
+        ruta = os.path.join(salida, nombre_archivo(ctx.hasta, zona))
+        escribir(ruta, html)
+        escritos.append((ruta, len(filas), len(html.encode("utf-8"))))
+    return escritos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta el reporte One Page a HTML estático autocontenido.")
+    parser.add_argument("--libro", default=RUTA_LIBRO, help="libro semanal de respaldo (.xlsx)")
+    parser.add_argument("--desde", help="primera semana: 2025Sem40, 2025-W40 o 40 (default: las últimas 4)")
+    parser.add_argument("--hasta", help="última semana: 2025Sem43, 2025-W43 o 43 (default: la más reciente)")
+    parser.add_argument("--graficas", choices=["png", "svg"],
+                        default=CONFIG.modo_graficos,
+                        help="PNG de Visuals.py o SVG de la hoja 'graficas' (mucho más liviano)")
+    parser.add_argument("--semana-graficas", default=None,
+                        help="carpeta de Visualizations para --graficas png (default: la de --hasta)")
+    parser.add_argument("--por-zona", action="store_true", help="un archivo por zona")
+    parser.add_argument("--salida", default=CARPETA_SALIDA, help="carpeta de salida")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    escritos = exportar(args.libro, args.desde, args.hasta, args.graficas, args.semana_graficas,
+                        args.por_zona, args.salida)
+    for ruta, cobradores, tamano in escritos:
+        print(f"{ruta}: {cobradores} coordinadores, {tamano / 1024:,.0f} KB")
+    print(f"{len(escritos)} archivos en {time.perf_counter() - inicio:.2f} s")
@@ -0,0 +1,209 @@
+# exportar_tarjetas.py
+"""
+Exportación por lotes de la tarjeta de cada cobrador a PDF o PNG.
+
+Cada tarjeta se arma con el mismo código que el reporte estático
+(exportar_html.py: tarjeta.html, estilos.css y las gráficas de la semana como
+data URI) en una página HTML propia, y un navegador local sin interfaz
+(Chrome, Chromium o Edge en modo headless) la convierte en archivo. Las
+conversiones se reparten en un ProcessPoolExecutor.
+
+Como en Visuals.py, la carpeta de salida lleva un manifest.json: para cada
+cobrador, el hash de su HTML (que ya incluye datos, foto, gráficas, plantilla
+y estilos) y el SHA-256 del archivo generado. Al volver a correr sólo se
+regeneran las tarjetas cuyo HTML cambió o cuyo archivo falta, y se borra todo
+archivo anterior que no quede en el manifiesto (de quienes ya no están o de
+otro formato). SHA256SUMS lista los archivos en el formato de
+sha256sum para verificarlos después de enviarlos.
+
+El navegador se toma de ONEPAGE_NAVEGADOR o se busca en el PATH y en las
+rutas de instalación habituales de Windows.
+
+Uso:
+    python exportar_tarjetas.py [--formato pdf|png] [--desde 2025Sem40 --hasta 2025Sem43] [--graficas png|svg]
+                                [--semana-graficas 2025Sem43] [--workers N] [--forzar] [--salida CARPETA]
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from configuracion import CONFIG
+from esquema import etiqueta_semana
+from exportar_html import pagina_html, preparar_contexto
+from ingesta import hash_archivo
+from manifiestos import escribir_manifiesto, leer_manifiesto
+from pagina import tarjetas_html
+from preparacion import RUTA_LIBRO
+
+CARPETA_SALIDA = CONFIG.salida_tarjetas
+SUMAS = "SHA256SUMS"
+
+# Tamaño de la ventana del navegador (PNG) y tiempo máximo por tarjeta
+ANCHO, ALTO = 1600, 760
+TIEMPO_MAXIMO = 60
+
+NAVEGADORES = ["chrome", "google-chrome", "chromium", "chromium-browser", "msedge", "microsoft-edge"]
+RUTAS_WINDOWS = [
+    "C:/Program Files/Google/Chrome/Application/chrome.exe",
+    "C:/Program Files (x86)/Google/Chrome/Application/chrome.exe",
+    "C:/Program Files (x86)/Microsoft/Edge/Application/msedge.exe",
+    "C:/Program Files/Microsoft/Edge/Application/msedge.exe",
+]
+
+
+def buscar_navegador():
+    """Ruta del navegador headless; None si no hay ninguno instalado."""
+    configurado = CONFIG.navegador
+    if configurado:
+        return configurado
+    for nombre in NAVEGADORES:
+        ruta = shutil.which(nombre)
+        if ruta:
+            return ruta
+    return next((ruta for ruta in RUTAS_WINDOWS if os.path.exists(ruta)), None)
+
+
+def comando_navegador(navegador, html, destino, formato):
+    comando = [navegador, "--headless=new", "--disable-gpu", "--hide-scrollbars", "--no-first-run",
+               f"--window-size={ANCHO},{ALTO}"]
+    if formato == "pdf":
+        comando += ["--no-pdf-header-footer", f"--print-to-pdf={destino}"]
+    else:
+        comando += [f"--screenshot={destino}"]
+    return comando + [Path(html).resolve().as_uri()]
+
+
+def renderizar(tarea):
+    """Convierte un HTML en PDF/PNG (en un proceso del pool). Devuelve (nombre, sha256 o None, error)."""
+    nombre, navegador, html, destino, formato = tarea
+    tmp = f"{destino}.tmp.{formato}"
+    try:
+        subprocess.run(comando_navegador(navegador, html, tmp, formato), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=TIEMPO_MAXIMO)
+        os.replace(tmp, destino)
+    except (OSError, subprocess.SubprocessError) as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return nombre, None, str(e)
+    return nombre, hash_archivo(destino), ""
+
+
+def escribir_sumas(carpeta, manifiesto):
+    """SHA256SUMS con los archivos del manifiesto, en el formato de sha256sum."""
+    with open(os.path.join(carpeta, SUMAS), "w", encoding="utf-8", newline="\n") as f:
+        for datos in sorted(manifiesto["cobradores"].values(), key=lambda d: d["archivo"]):
+            f.write(f"{datos['sha256']}  {datos['archivo']}\n")
+
+
+def paginas_por_cobrador(ctx):
+    """(nombre, nombre sin espacios, HTML de una página con sólo su tarjeta) en orden de ranking."""
+    tarjetas = tarjetas_html(ctx.plantilla, ctx.semanal, ctx.resumen, 0, len(ctx.resumen),
+                             ctx.url_imagen, ctx.visualizaciones)
+    for cobrador, tarjeta in zip(ctx.resumen.itertuples(), tarjetas):
+        titulo = f"{cobrador.Index} - {etiqueta_semana(ctx.hasta)}"
+        yield cobrador.Index, cobrador.nombre_junto, pagina_html(ctx, titulo, [tarjeta])
+
+
+def exportar_tarjetas(ruta_libro=RUTA_LIBRO, formato="pdf", desde=None, hasta=None, graficas="png",
+                      carpeta_graficas=None, workers=1, forzar=False, salida=CARPETA_SALIDA, navegador=None):
+    """
+    Genera las tarjetas pendientes del rango en salida/<año>Sem<hasta>/ (p. ej. 2025Sem43).
+
+    Devuelve: (generadas, sin cambios, archivos eliminados, errores) con errores como lista de (nombre, mensaje).
+    """
+    navegador = navegador or buscar_navegador()
+    if not navegador:
+        raise RuntimeError("No se encontró Chrome/Chromium/Edge; indique la ruta en ONEPAGE_NAVEGADOR")
+
+    ctx = preparar_contexto(ruta_libro, desde, hasta, graficas, carpeta_graficas)
+    carpeta = os.path.join(salida, etiqueta_semana(ctx.hasta))
+    os.makedirs(carpeta, exist_ok=True)
+    manifiesto = leer_manifiesto(carpeta)
+    previos = manifiesto["cobradores"]
+
+    actuales, pendientes = {}, []
+    with tempfile.TemporaryDirectory(dir=carpeta) as temporal:
+        for nombre, nombre_junto, html in paginas_por_cobrador(ctx):
+            archivo = f"{nombre_junto}.{formato}"
+            entrada = hashlib.sha256(f"{formato}|{ANCHO}x{ALTO}|{html}".encode("utf-8")).hexdigest()
+            actuales[nombre] = {"hash": entrada, "archivo": archivo, "sha256": previos.get(nombre, {}).get("sha256")}
+            previo = previos.get(nombre, {})
+            if forzar or previo.get("hash") != entrada or previo.get("archivo") != archivo \
+                    or not os.path.exists(os.path.join(carpeta, archivo)):
+                ruta_html = os.path.join(temporal, f"{nombre_junto}.html")
+                with open(ruta_html, "w", encoding="utf-8") as f:
+                    f.write(html)
+                pendientes.append((nombre, navegador, ruta_html, os.path.join(carpeta, archivo), formato))
+
+        if workers <= 1:
+            resultados = [renderizar(t) for t in pendientes]
+        else:
+            chunksize = max(1, len(pendientes) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                resultados = list(executor.map(renderizar, pendientes, chunksize=chunksize))
+
+    errores = []
+    for nombre, sha256, error in resultados:
+        if sha256 is None:
+            errores.append((nombre, error))
+            # Sin archivo nuevo no se registra: la próxima corrida lo vuelve a intentar
+            actuales.pop(nombre)
+        else:
+            actuales[nombre]["sha256"] = sha256
+
+    # Se borran los archivos anteriores que ya no están en el manifiesto: de cobradores que
+    # salieron, los de otro formato o nombre y los desactualizados de las tarjetas que
+    # fallaron (no deben enviarse)
+    vigentes = {datos["archivo"] for datos in actuales.values()}
+    eliminadas = 0
+    for datos in previos.values():
+        archivo = datos.get("archivo")
+        if archivo and archivo not in vigentes:
+            try:
+                os.remove(os.path.join(carpeta, archivo))
+                eliminadas += 1
+            except FileNotFoundError:
+                pass
+    manifiesto = {"formato": formato, "cobradores": actuales}
+    escribir_manifiesto(carpeta, manifiesto)
+    escribir_sumas(carpeta, manifiesto)
+
+    generadas = len(pendientes) - len(errores)
+    return generadas, len(actuales) - generadas, eliminadas, errores
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta la tarjeta de cada cobrador a PDF o PNG.")
+    parser.add_argument("--libro", default=RUTA_LIBRO, help="libro semanal de respaldo (.xlsx)")
+    parser.add_argument("--formato", choices=["pdf", "png"], default="pdf")
+    parser.add_argument("--desde", help="primera semana: 2025Sem40, 2025-W40 o 40 (default: las últimas 4)")
+    parser.add_argument("--hasta", help="última semana: 2025Sem43, 2025-W43 o 43 (default: la más reciente)")
+    parser.add_argument("--graficas", choices=["png", "svg"],
+                        default=CONFIG.modo_graficos,
+                        help="PNG de Visuals.py o SVG de la hoja 'graficas'")
+    parser.add_argument("--semana-graficas", default=None,
+                        help="carpeta de Visualizations para --graficas png (default: la de --hasta)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="navegadores en paralelo (default: núcleos disponibles)")
+    parser.add_argument("--forzar", action="store_true", help="regenera todas las tarjetas")
+    parser.add_argument("--salida", default=CARPETA_SALIDA, help="carpeta de salida")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    try:
+        generadas, sin_cambios, eliminadas, errores = exportar_tarjetas(
+            args.libro, args.formato, args.desde, args.hasta, args.graficas, args.semana_graficas,
+            args.workers, args.forzar, args.salida,
+        )
+    except RuntimeError as error:
+        raise SystemExit(str(error))
+    for nombre, error in errores:
+        print(f"ERROR {nombre}: {error}")
+    print(f"{generadas} generadas, {sin_cambios} sin cambios, {eliminadas} eliminadas, {len(errores)} con error "
+          f"({args.workers} procesos): {time.perf_counter() - inicio:.2f} s")
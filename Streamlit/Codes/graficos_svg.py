@@ -0,0 +1,107 @@
+# graficos_svg.py
+"""
+Gráficas de la tarjeta dibujadas en el navegador a partir de la hoja 'graficas'.
+
+Son ocho números por cobrador, así que en lugar de incrustar los PNG de 400 dpi
+que genera Visuals.py se emite un SVG ligero para el dictamen y una tabla HTML
+para los pagos cumplidos, con las etiquetas y colores de estilo_graficas.py
+(los mismos que Visuals.py). Todo va en una sola línea porque st.markdown
+corta el bloque HTML en la primera línea vacía.
+"""
+import math
+
+from estilo_graficas import COLUMNAS_DICTAMEN, COLUMNAS_PAGOS, barra_color_dictamen, texto_color
+
+# Lienzo del SVG (unidades del viewBox) y márgenes del área de la gráfica
+ANCHO, ALTO = 600, 400
+IZQ, DER, ARRIBA, ABAJO = 70, 20, 40, 110
+
+
+def llave_cobrador(nombre):
+    """Llave de cruce por nombre, insensible a espacios y mayúsculas."""
+    return str(nombre).replace(" ", "").casefold()
+
+
+def _escala(maximo, marcas=5):
+    """Marcas 'redondas' del eje Y de 0 a un tope >= maximo."""
+    if maximo <= 0:
+        return [0, 1]
+    paso_bruto = maximo / marcas
+    magnitud = 10 ** math.floor(math.log10(paso_bruto))
+    paso = next(m * magnitud for m in (1, 2, 2.5, 5, 10) if m * magnitud >= paso_bruto)
+    tope = math.ceil(maximo / paso) * paso
+    return [round(i * paso, 10) for i in range(int(round(tope / paso)) + 1)]
+
+
+def _numero(valor):
+    return f"{valor:,.0f}" if float(valor).is_integer() else f"{valor:,.2f}"
+
+
+def svg_dictamen(valores):
+    """Gráfica de barras del dictamen como SVG en línea."""
+    marcas = _escala(max(valores))
+    tope = marcas[-1]
+    alto_area = ALTO - ARRIBA - ABAJO
+    ancho_area = ANCHO - IZQ - DER
+    banda = ancho_area / len(valores)
+
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {ANCHO} {ALTO}" '
+        f'style="width:100%; height:300px;" font-family="sans-serif" fill="{texto_color}">',
+        f'<text x="{IZQ + ancho_area / 2:.1f}" y="{ARRIBA - 14}" text-anchor="middle" font-size="18">Dictamen</text>',
+    ]
+    for marca in marcas:
+        y = ARRIBA + alto_area * (1 - marca / tope)
+        partes.append(
+            f'<line x1="{IZQ - 5}" y1="{y:.1f}" x2="{IZQ}" y2="{y:.1f}" stroke="{texto_color}"/>'
+            f'<text x="{IZQ - 9}" y="{y + 4:.1f}" text-anchor="end" font-size="13">{_numero(marca)}</text>'
+        )
+    for i, (etiqueta, valor) in enumerate(zip(COLUMNAS_DICTAMEN.values(), valores)):
+        alto = alto_area * valor / tope
+        x = IZQ + banda * i + banda * 0.1
+        centro = IZQ + banda * (i + 0.5)
+        base = ARRIBA + alto_area
+        partes.append(
+            f'<rect x="{x:.1f}" y="{base - alto:.1f}" width="{banda * 0.8:.1f}" height="{alto:.1f}" '
+            f'fill="{barra_color_dictamen}"><title>{etiqueta}: {_numero(valor)}</title></rect>'
+            f'<text transform="translate({centro:.1f},{base + 16}) rotate(-20)" text-anchor="end" '
+            f'font-size="15">{etiqueta}</text>'
+        )
+    base = ARRIBA + alto_area
+    partes.append(
+        f'<line x1="{IZQ}" y1="{ARRIBA}" x2="{IZQ}" y2="{base}" stroke="{texto_color}"/>'
+        f'<line x1="{IZQ}" y1="{base}" x2="{ANCHO - DER}" y2="{base}" stroke="{texto_color}"/>'
+        "</svg>"
+    )
+    return "".join(partes)
+
+
+def tabla_pagos(valores):
+    """Tabla de pagos cumplidos como HTML en línea."""
+    celda = f"border:1px solid {texto_color}; padding:8px 12px; text-align:center; color:{texto_color};"
+    filas = "".join(
+        f'<tr><td style="{celda}">{etiqueta}</td><td style="{celda}">{_numero(valor)}</td></tr>'
+        for etiqueta, valor in zip(COLUMNAS_PAGOS.values(), valores)
+    )
+    return (
+        '<table style="width:75%; border-collapse:collapse; font-size:16px; margin:auto;">'
+        f"{filas}</table>"
+    )
+
+
+def graficos_por_cobrador(df_graficas):
+    """
+    HTML de las dos gráficas de cada cobrador de la hoja 'graficas'.
+
+    Devuelve: dict llave_cobrador(nombre) -> HTML listo para 'visualizaciones'.
+    """
+    df = df_graficas.fillna(0)
+    dictamen = df[list(COLUMNAS_DICTAMEN)].to_numpy(dtype=float).tolist()
+    pagos = df[list(COLUMNAS_PAGOS)].to_numpy(dtype=float).tolist()
+    graficos = {}
+    for nombre, valores_dictamen, valores_pagos in zip(df["nombre"], dictamen, pagos):
+        graficos[llave_cobrador(nombre)] = (
+            f'<div class="grafico">{svg_dictamen(valores_dictamen)}</div>'
+            f'<div class="grafico">{tabla_pagos(valores_pagos)}</div>'
+        )
+    return graficos
@@ -0,0 +1,124 @@
+# huellas.py
+"""
+Caché en proceso con llaves baratas: argumentos + huella de los archivos fuente.
+
+La huella de un archivo es (ruta, mtime_ns, tamaño): se obtiene con un solo
+os.stat, sin leer ni hashear el contenido, y cambia cuando el archivo se
+modifica, se reemplaza o desaparece. Cada función decorada con
+cache_por_huella declara de qué archivos depende ('fuentes'); en cada
+llamada se comparan sus huellas con las de la entrada guardada y, si alguna
+cambió, el resultado se recalcula y reemplaza al anterior.
+
+El resultado se comparte (no se copia ni se serializa como en st.cache_data),
+así que no debe modificarse. Los cachés se registran por nombre: al volver a
+ejecutar el script de Streamlit, el decorador reutiliza el caché existente.
+Cada uno lleva contadores de aciertos y fallos, y invalidar(ruta) descarta a
+mano las entradas que dependen de un archivo.
+"""
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+
+def huella(path):
+    """(ruta, mtime_ns, tamaño) del archivo o carpeta; (ruta, None, None) si no existe."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def huellas(paths):
+    return tuple(huella(path) for path in paths)
+
+
+class CacheHuellas:
+    """
+    LRU de resultados por argumentos, válido mientras no cambie la huella de sus fuentes.
+
+    - funcion: la función a memorizar (argumentos hashables)
+    - fuentes: función con los mismos argumentos que devuelve las rutas de las que depende
+    - max_items: número máximo de combinaciones de argumentos guardadas
+    """
+
+    def __init__(self, nombre, funcion, fuentes, max_items=32):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.fuentes = fuentes
+        self.max_items = max_items
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, *args):
+        actual = huellas(self.fuentes(*args))
+        with self._lock:
+            entrada = self._entradas.get(args)
+            if entrada is not None and entrada[0] == actual:
+                self.aciertos += 1
+                self._entradas.move_to_end(args)
+                return entrada[1]
+            self.fallos += 1
+
+        valor = self.funcion(*args)
+        with self._lock:
+            self._entradas[args] = (actual, valor)
+            self._entradas.move_to_end(args)
+            while len(self._entradas) > self.max_items:
+                self._entradas.popitem(last=False)
+        return valor
+
+    def invalidar(self, path=None):
+        """Descarta las entradas que dependen de 'path' (todas si no se indica). Devuelve cuántas."""
+        with self._lock:
+            if path is None:
+                claves = list(self._entradas)
+            else:
+                claves = [
+                    args for args, (fuentes, _) in self._entradas.items()
+                    if any(ruta == path for ruta, _, _ in fuentes)
+                ]
+            for args in claves:
+                del self._entradas[args]
+        return len(claves)
+
+    def estadisticas(self):
+        with self._lock:
+            return {"aciertos": self.aciertos, "fallos": self.fallos, "entradas": len(self._entradas)}
+
+
+# nombre -> CacheHuellas de todo el proceso
+REGISTRO = {}
+_lock_registro = threading.Lock()
+
+
+def cache_por_huella(fuentes, max_items=32, nombre=None):
+    """
+    Decorador: memoriza la función por argumentos + huella de fuentes(*args).
+
+    El caché se identifica por 'nombre' (por defecto, módulo.función) y
+    sobrevive a que el decorador se vuelva a aplicar en cada rerun.
+    """
+    def decorador(funcion):
+        clave = nombre or f"{funcion.__module__}.{funcion.__qualname__}"
+        with _lock_registro:
+            cache = REGISTRO.get(clave)
+            if cache is None:
+                cache = REGISTRO[clave] = CacheHuellas(clave, funcion, fuentes, max_items)
+            else:
+                cache.funcion, cache.fuentes, cache.max_items = funcion, fuentes, max_items
+        return functools.wraps(funcion)(cache)
+    return decorador
+
+
+def invalidar(path=None):
+    """Invalida en todos los cachés las entradas que dependen de 'path' (todas si no se indica)."""
+    return sum(cache.invalidar(path) for cache in list(REGISTRO.values()))
+
+
+def estadisticas():
+    """Aciertos, fallos y entradas de cada caché registrado."""
+    return {nombre: cache.estadisticas() for nombre, cache in list(REGISTRO.items())}
@@ -0,0 +1,80 @@
+# indices.py
+"""
+Índices precalculados para los filtros de zona, cobrador y semanas.
+
+- IndiceSemanas: los hechos se ordenan una vez por año y semana y se guardan
+  sus claves (anio * 100 + semana), así que un rango de semanas es un slice
+  contiguo (búsqueda binaria, sin copiar el DataFrame).
+- IndiceCobradores: sobre el resumen ya ordenado por ranking, zona y nombre
+  se codifican como categorías con sus posiciones en el ranking; filtrar es
+  buscar en un diccionario y tomar esas posiciones, sin volver a agregar.
+"""
+import numpy as np
+import pandas as pd
+
+from esquema import Datos, claves_semana
+
+
+class IndiceSemanas:
+    """
+    Hechos ordenados por año y semana con búsqueda binaria por rango.
+
+    Las semanas y los límites de 'rango' son claves anio * 100 + semana.
+    - fuentes: rutas de las que se cargaron los datos (para las llaves de caché)
+    """
+
+    def __init__(self, datos, fuentes=()):
+        self._fuentes = list(fuentes)
+        self.cobradores = datos.cobradores
+        self.hechos = datos.hechos.sort_values(["anio", "semana"], kind="stable").reset_index(drop=True)
+        self._claves_filas = claves_semana(self.hechos)
+        self.semanas = np.unique(self._claves_filas).tolist()
+
+    def rango(self, desde, hasta):
+        """Datos con la vista de los hechos con desde <= clave <= hasta (la tabla de cobradores completa)."""
+        inicio = np.searchsorted(self._claves_filas, desde, side="left")
+        fin = np.searchsorted(self._claves_filas, hasta, side="right")
+        return Datos(self.cobradores, self.hechos.iloc[inicio:fin])
+
+    def fuentes(self, desde, hasta):
+        """Archivos de los que salieron los hechos (el libro semanal); cualquier rango depende de todos."""
+        return self._fuentes
+
+    def ultimas(self, n):
+        """(desde, hasta) de las claves de las últimas n semanas disponibles."""
+        if not self.semanas:
+            return None, None
+        return self.semanas[-n:][0], self.semanas[-1]
+
+
+class IndiceCobradores:
+    """Posiciones en el ranking por zona y por nombre (códigos categóricos)."""
+
+    def __init__(self, resumen):
+        zonas = pd.Categorical(resumen["zona"].astype(str))
+        self.zonas = list(zonas.categories)
+        # Posiciones agrupadas por código de zona; dentro de cada grupo siguen en orden de ranking
+        orden = np.argsort(zonas.codes, kind="stable")
+        limites = np.searchsorted(zonas.codes[orden], np.arange(len(self.zonas) + 1))
+        self._por_zona = {
+            zona: orden[limites[i]:limites[i + 1]] for i, zona in enumerate(self.zonas)
+        }
+        self.nombres = resumen.index.tolist()
+        self._posicion = {nombre: i for i, nombre in enumerate(self.nombres)}
+
+    def nombres_de(self, zonas=None):
+        """Cobradores de las zonas indicadas (todas si no se indica ninguna), en orden de ranking."""
+        if not zonas:
+            return self.nombres
+        return [self.nombres[i] for i in self.posiciones(zonas=zonas)]
+
+    def posiciones(self, zonas=None, nombres=None):
+        """Posiciones (ordenadas) del ranking que cumplen ambos filtros; vacío o None = sin filtro."""
+        if zonas:
+            pos = np.sort(np.concatenate([self._por_zona.get(z, np.empty(0, dtype=np.intp)) for z in zonas]))
+        else:
+            pos = np.arange(len(self.nombres))
+        if nombres:
+            elegidos = np.array(sorted(self._posicion[n] for n in nombres if n in self._posicion), dtype=np.intp)
+            pos = np.intersect1d(pos, elegidos, assume_unique=True)
+        return pos
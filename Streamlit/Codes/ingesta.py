@@ -0,0 +1,231 @@
+# ingesta.py
+"""
+Caché columnar (Parquet) de los libros semanales de Excel.
+
+Leer el .xlsx con openpyxl es lo más lento del arranque, así que cada libro
+semanal se convierte una sola vez a un Parquet tipado por hoja ('one_page' y
+'graficas'). El caché se guarda en la carpeta de cachés de la configuración
+(CONFIG.cache/libros, no junto al libro, que puede estar en un recurso de sólo
+lectura) y se identifica con la fecha de modificación, el tamaño y el hash
+SHA-256 del archivo fuente; si el libro cambia, se vuelve a leer el Excel.
+
+Las hojas sólo traen el número de semana, así que al leer el libro se agrega
+la columna 'anio' (agregar_anio): sale del archivo (una columna 'anio', el
+año en el nombre o la fecha en que se guardó el libro), nunca del reloj, para
+que la semana 43 de 2025 siga siendo 2025Sem43 aunque se lea en 2026.
+
+Uso como paso de construcción:
+    python ingesta.py D:/Cobranza/Streamlit/Resources/Data/op_sl_sem43.xlsx
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from configuracion import CONFIG
+
+try:
+    import pyarrow  # noqa: F401  (motor de Parquet para pandas)
+    PARQUET_DISPONIBLE = True
+except ImportError:
+    PARQUET_DISPONIBLE = False
+
+HOJAS = ["one_page", "graficas"]
+CARPETA_CACHE = os.path.join(CONFIG.cache, "libros")
+VERSION_CACHE = 2
+
+
+def hash_archivo(path, bloque=1 << 20):
+    """SHA-256 del archivo leído por bloques."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for trozo in iter(lambda: f.read(bloque), b""):
+            h.update(trozo)
+    return h.hexdigest()
+
+
+def _rutas_cache(path):
+    carpeta = CARPETA_CACHE
+    # El nombre lleva un hash de la ruta: dos libros con el mismo nombre en carpetas distintas no se pisan
+    ruta = os.path.abspath(path)
+    base = f"{os.path.splitext(os.path.basename(ruta))[0]}-{hashlib.sha1(ruta.encode('utf-8')).hexdigest()[:8]}"
+    meta = os.path.join(carpeta, f"{base}.json")
+    hojas = {hoja: os.path.join(carpeta, f"{base}.{hoja}.parquet") for hoja in HOJAS}
+    return carpeta, meta, hojas
+
+
+def _leer_meta(ruta_meta):
+    try:
+        with open(ruta_meta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _escribir_meta(ruta_meta, meta):
+    tmp = ruta_meta + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, ruta_meta)
+
+
+def cache_vigente(path):
+    """
+    Indica si el Parquet en caché corresponde al libro actual.
+
+    Primero compara mtime y tamaño (barato); si sólo cambió el mtime se
+    recalcula el hash para no reconstruir por un simple 'touch' o copia.
+    """
+    _, ruta_meta, rutas_hojas = _rutas_cache(path)
+    meta = _leer_meta(ruta_meta)
+    if not meta or meta.get("version") != VERSION_CACHE:
+        return False
+    if not all(os.path.exists(r) for r in rutas_hojas.values()):
+        return False
+    stat = os.stat(path)
+    if meta["size"] != stat.st_size:
+        return False
+    if meta["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    if meta["sha256"] != hash_archivo(path):
+        return False
+    # Mismo contenido con otra fecha: actualizamos la llave y seguimos usando el caché
+    meta["mtime_ns"] = stat.st_mtime_ns
+    _escribir_meta(ruta_meta, meta)
+    return True
+
+
+def tipar_texto(df):
+    """Deja las columnas de texto sólo con str o nulos para que Parquet las guarde tipadas."""
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+# ---------- Año de las semanas ----------
+def anio_en_nombre(path):
+    """Año de 4 cifras en el nombre del archivo (op_sl_2025_sem43.xlsx -> 2025), o None."""
+    encontrado = re.search(r"(?<!\d)(20\d\d)(?!\d)", os.path.basename(path))
+    return int(encontrado.group(1)) if encontrado else None
+
+
+def fecha_libro(path):
+    """Fecha en que se guardó el .xlsx (metadatos del libro; si no, la de creación), o None."""
+    if not path.lower().endswith((".xlsx", ".xlsm")):
+        return None
+    libro = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return libro.properties.modified or libro.properties.created
+    finally:
+        libro.close()
+
+
+def anios_semanas(semanas, anio, semana_referencia):
+    """Año de cada semana: el de la referencia, o el anterior para las semanas posteriores a ella."""
+    return np.where(np.asarray(semanas) > semana_referencia, anio - 1, anio)
+
+
+def ultima_semana(semanas):
+    """
+    Última semana de un archivo. Si cruza el fin de año (p. ej. 50-52 y 1-3),
+    las semanas altas son del año anterior y la última es la más alta de las bajas.
+    """
+    unicas = np.unique(semanas)
+    if unicas[-1] - unicas[0] > 26:
+        return int(unicas[unicas <= 26].max())
+    return int(unicas[-1])
+
+
+def agregar_anio(df, path, anio=None):
+    """
+    Agrega la columna 'anio' (año de cada semana) a una hoja con 'semana'.
+
+    El año se toma, en este orden, de:
+    1. 'anio' explícito (--anio de almacen.py): el año de la última semana del archivo
+    2. la columna 'anio' si la hoja ya la trae (sólo se completan sus vacíos)
+    3. un año de 4 cifras en el nombre del archivo, también el de la última semana
+    4. la fecha en que se guardó el libro: cada semana es la más reciente que
+       no pasa de la semana ISO de esa fecha
+    5. el ajuste 'anio' de la configuración (año de la última semana)
+
+    Sin ninguno lanza ValueError: la semana sola no dice de qué año es.
+    """
+    if "semana" not in df.columns or df.empty:
+        return df
+    if not anio and "anio" in df.columns and df["anio"].notna().all():
+        return df
+    semanas = pd.to_numeric(df["semana"], errors="coerce")
+    if semanas.isna().any():
+        return df  # esquema.validar reporta la semana inválida
+    referencia = anio or anio_en_nombre(path)
+    fecha = None if referencia else fecha_libro(path)
+    if referencia:
+        anios = anios_semanas(semanas, int(referencia), ultima_semana(semanas))
+    elif fecha is not None:
+        anio_iso, semana_iso, _ = fecha.isocalendar()
+        anios = anios_semanas(semanas, anio_iso, semana_iso)
+    elif CONFIG.anio:
+        anios = anios_semanas(semanas, int(CONFIG.anio), ultima_semana(semanas))
+    else:
+        raise ValueError(
+            f"{path}: no se puede saber el año de las semanas; agregue una columna 'anio', "
+            "ponga el año en el nombre del archivo o indíquelo con --anio / ONEPAGE_ANIO"
+        )
+    anios = pd.Series(anios, index=df.index)
+    if "anio" in df.columns and not anio:
+        anios = df["anio"].fillna(anios)
+    return df.assign(anio=anios.astype(np.int16))
+
+
+def construir_cache(path):
+    """Lee todas las hojas del libro en una sola pasada y guarda un Parquet por hoja (con 'anio')."""
+    hojas = pd.read_excel(path, sheet_name=HOJAS, engine="openpyxl")
+    hojas = {nombre: agregar_anio(tipar_texto(df), path) for nombre, df in hojas.items()}
+    if not PARQUET_DISPONIBLE:
+        return hojas
+
+    carpeta, ruta_meta, rutas_hojas = _rutas_cache(path)
+    os.makedirs(carpeta, exist_ok=True)
+    stat = os.stat(path)
+    for nombre, df in hojas.items():
+        tmp = rutas_hojas[nombre] + ".tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, rutas_hojas[nombre])
+    _escribir_meta(ruta_meta, {
+        "version": VERSION_CACHE,
+        "fuente": os.path.abspath(path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": hash_archivo(path),
+        "hojas": {nombre: os.path.basename(r) for nombre, r in rutas_hojas.items()},
+    })
+    return hojas
+
+
+def leer_hoja(path, hoja):
+    """Devuelve la hoja desde el Parquet si está vigente; si no, desde el Excel (y regenera el caché)."""
+    if PARQUET_DISPONIBLE and cache_vigente(path):
+        _, _, rutas_hojas = _rutas_cache(path)
+        return pd.read_parquet(rutas_hojas[hoja])
+    return construir_cache(path)[hoja]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python ingesta.py <libro.xlsx> [<libro.xlsx> ...]")
+        sys.exit(1)
+    if not PARQUET_DISPONIBLE:
+        print("pyarrow no está instalado: no se puede generar el caché Parquet")
+        sys.exit(1)
+    for libro in sys.argv[1:]:
+        if cache_vigente(libro):
+            print(f"{libro}: caché vigente")
+        else:
+            construir_cache(libro)
+            print(f"{libro}: caché generado")
@@ -0,0 +1,30 @@
+# manifiestos.py
+"""
+Manifiestos de las carpetas de salida regeneradas por partes.
+
+Visuals.py (Visualizations/<semana>) y exportar_tarjetas.py (Tarjetas/<semana>)
+guardan junto a sus archivos un manifest.json con el hash de lo que produjo
+cada cobrador; al volver a correr sólo regeneran lo que cambió. Un manifiesto
+ilegible o ausente cuenta como vacío (se regenera todo) y se escribe con un
+archivo temporal y os.replace, para que una corrida interrumpida no lo deje
+a medias.
+"""
+import json
+import os
+
+MANIFIESTO = "manifest.json"
+
+
+def leer_manifiesto(carpeta):
+    try:
+        with open(os.path.join(carpeta, MANIFIESTO), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"cobradores": {}}
+
+
+def escribir_manifiesto(carpeta, manifiesto):
+    ruta = os.path.join(carpeta, MANIFIESTO)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2, ensure_ascii=False)
+    os.replace(ruta + ".tmp", ruta)
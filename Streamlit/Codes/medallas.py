@@ -0,0 +1,57 @@
+# medallas.py
+"""
+Clasificación de medallas (círculo verde, amarillo o rojo) por columna completa.
+
+En lugar de llamar a una función por celda, cada métrica se clasifica de una
+vez con NumPy contra una tabla de umbrales. El resultado son arreglos de
+colores y textos alineados con las filas del DataFrame, que el render de
+tarjetas indexa directamente (el marcado está en la macro 'medalla' de
+Resources/Templates/macros.html).
+"""
+import numpy as np
+
+# Umbrales por tipo (escala 0–100 para porcentajes): (inicio amarillo, inicio verde)
+#   v < amarillo -> rojo | amarillo <= v < verde -> amarillo | v >= verde -> verde
+REGLAS = {
+    "contacto": (40, 65),
+    "promesas_cumplidas": (40, 60),
+    "logro_meta": (50, 70),
+    "visitas": (10, 15),
+    "plantilla": (80, 90),
+}
+
+COLORES = np.array(["#FF4C4C", "#FFD700", "#32CD32"], dtype=object)  # rojo, amarillo, verde
+COLOR_DEFAULT = "#808080"  # gris para tipos sin regla
+
+def clasificar_medallas(valores, tipo):
+    """
+    Clasifica una columna completa de valores.
+
+    Los valores entre 0 y 1 se tratan como porcentaje (se pasan a 0–100 y se
+    muestran con un decimal y '%'); el resto se muestra como entero con
+    separador de miles. Los nulos devuelven color y texto vacíos.
+
+    Devuelve: (colores, textos) como arreglos de objetos del mismo largo que 'valores'.
+    """
+    # Siempre en float64, como los valores de la hoja: el redondeo a un decimal
+    # de lo que se muestra es el mismo que el de generar_medalla
+    v = np.asarray(valores, dtype=np.float64)
+    nulos = np.isnan(v)
+    es_porcentaje = (v >= 0) & (v <= 1)
+    val = np.where(es_porcentaje, v * 100, v)
+
+    if tipo in REGLAS:
+        colores = COLORES[np.digitize(np.where(nulos, 0, val), REGLAS[tipo])]
+    else:
+        colores = np.full(v.shape, COLOR_DEFAULT, dtype=object)
+
+    textos = np.empty(v.shape, dtype=object)
+    pct = es_porcentaje & ~nulos
+    textos[pct] = np.char.mod("%.1f%%", val[pct]).astype(object)
+    enteros = ~es_porcentaje & ~nulos
+    textos[enteros] = [f"{x:,}" for x in np.trunc(val[enteros]).astype(np.int64).tolist()]
+
+    colores = np.where(nulos, "", colores)
+    textos[nulos] = ""
+    return colores, textos
+
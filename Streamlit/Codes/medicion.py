@@ -0,0 +1,106 @@
+# medicion.py
+"""
+Medición por etapas del dashboard y de los scripts por lotes.
+
+Una Medicion acumula, por nombre de etapa, los segundos, el número de
+llamadas y los bytes producidos; la misma etapa puede cronometrarse muchas
+veces (p. ej. el render de cada tarjeta) y se suma. Al final se obtienen
+registros planos (registros()) que se muestran en el panel de OnePage.py,
+se imprimen en consola o se agregan como JSON Lines a un archivo de log:
+
+    {"fecha": ..., "corrida": ..., "script": "OnePage", "parte": "tarjetas",
+     "etapa": "jinja", "segundos": 0.012, "llamadas": 20, "bytes": 214830}
+
+Una Medicion inactiva (SIN_MEDICION) no toma tiempos: es lo que usan las
+funciones compartidas cuando nadie pide medir.
+"""
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from configuracion import CONFIG
+
+# "panel" (tabla en la página), "json" (log en RUTA_LOG_MEDICION) o "panel,json"; vacío = sin medición
+MODO_MEDICION = CONFIG.medicion
+RUTA_LOG_MEDICION = os.path.join(CONFIG.cache, "medicion.jsonl")
+
+
+class Medicion:
+    def __init__(self, activa=True, **contexto):
+        self.activa = activa
+        self.contexto = contexto
+        self.corrida = uuid.uuid4().hex[:12]
+        self.fecha = datetime.now().isoformat(timespec="seconds")
+        # etapa -> {"segundos", "llamadas", "bytes", ...detalle}; en orden de aparición
+        self.etapas = {}
+
+    def _etapa(self, nombre):
+        etapa = self.etapas.get(nombre)
+        if etapa is None:
+            etapa = self.etapas[nombre] = {"segundos": 0.0, "llamadas": 0, "bytes": 0}
+        return etapa
+
+    @contextmanager
+    def etapa(self, nombre):
+        """Cronometra el bloque y lo suma a 'nombre'; el bloque puede agregar detalle al dict que recibe."""
+        if not self.activa:
+            yield {}
+            return
+        detalle = {}
+        inicio = time.perf_counter()
+        try:
+            yield detalle
+        finally:
+            etapa = self._etapa(nombre)
+            etapa["segundos"] += time.perf_counter() - inicio
+            etapa["llamadas"] += 1
+            etapa.update(detalle)
+
+    def iterar(self, nombre, iterable):
+        """Recorre 'iterable' sumando a 'nombre' lo que tarda en producir cada elemento (generadores perezosos)."""
+        if not self.activa:
+            yield from iterable
+            return
+        iterador = iter(iterable)
+        while True:
+            with self.etapa(nombre):
+                elemento = next(iterador, StopIteration)
+            if elemento is StopIteration:
+                return
+            yield elemento
+
+    def bytes(self, nombre, texto):
+        """Suma a 'nombre' el tamaño en UTF-8 de 'texto' (lo que se manda al navegador o se escribe)."""
+        if self.activa:
+            self._etapa(nombre)["bytes"] += len(texto.encode("utf-8"))
+
+    def total(self):
+        return sum(etapa["segundos"] for etapa in self.etapas.values())
+
+    def registros(self):
+        """Un dict plano por etapa con la fecha, la corrida y el contexto (script, parte...)."""
+        return [
+            {"fecha": self.fecha, "corrida": self.corrida, **self.contexto, "etapa": nombre, **etapa}
+            for nombre, etapa in self.etapas.items()
+        ]
+
+    def escribir_json(self, ruta=RUTA_LOG_MEDICION):
+        """Agrega los registros al log en formato JSON Lines (uno por línea)."""
+        if not self.activa or not self.etapas:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        with open(ruta, "a", encoding="utf-8") as f:
+            for registro in self.registros():
+                f.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+
+    def imprimir(self):
+        for nombre, etapa in self.etapas.items():
+            tamano = f"{etapa['bytes'] / 1024:,.0f} KB" if etapa["bytes"] else ""
+            print(f"{nombre:<11} {etapa['segundos']:8.3f} s  {tamano:>9}  {etapa.get('texto', '')}")
+        print(f"{'total':<11} {self.total():8.3f} s")
+
+
+SIN_MEDICION = Medicion(activa=False)
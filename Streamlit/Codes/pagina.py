@@ -0,0 +1,59 @@
+# pagina.py
+"""
+Piezas de la página One Page que no dependen de Streamlit.
+
+Las comparten el dashboard (OnePage.py) y el exportador estático
+(exportar_html.py): hoja de estilos, header institucional, gráficas PNG de la
+tarjeta y el recorrido que arma el HTML de cada tarjeta.
+"""
+from activos import clave_activo
+from configuracion import CONFIG
+from medicion import SIN_MEDICION
+from tarjetas import pagina_tarjetas, render_tarjeta
+
+RUTA_CSS = CONFIG.css
+RUTA_LOGO = CONFIG.logo
+
+
+def estilos_css(ruta=RUTA_CSS):
+    with open(ruta) as f:
+        css = f.read()
+    return f"<style>{css}</style>"
+
+
+def encabezado_html(entorno, logo_src):
+    """Header institucional (encabezado.html) con el logo ya resuelto (data URI o URL)."""
+    return entorno.get_template("encabezado.html").render(logo=logo_src)
+
+
+def html_graficos_png(rutas, url_imagen):
+    """Bloques <img> de las gráficas PNG que existan; url_imagen(clave) da el src."""
+    visuales = []
+    for ruta in rutas:
+        clave = clave_activo(ruta)
+        if clave:
+            img_src = url_imagen(clave)
+            visuales.append(f'''<div class="grafico">
+                                <img src="{img_src}" style="width:100%; height:300px; object-fit:contain;">
+                            </div>''')
+    return "".join(visuales)
+
+
+def tarjetas_html(plantilla, semanal, resumen, desde, hasta, url_imagen, visualizaciones, medicion=SIN_MEDICION):
+    """
+    HTML de las tarjetas en las posiciones [desde, hasta) del ranking.
+
+    - url_imagen(clave): src de la foto a partir de su llave de activo
+    - visualizaciones(cobrador): HTML de las gráficas de la fila de resumen
+    - medicion: suma las etapas formato_medallas (formatear_filas), fotos,
+      graficas y jinja, y los bytes de las tarjetas
+    """
+    for cobrador, filas in medicion.iterar("formato_medallas", pagina_tarjetas(semanal, resumen, desde, hasta)):
+        with medicion.etapa("fotos"):
+            foto = url_imagen(clave_activo(cobrador.foto))
+        with medicion.etapa("graficas"):
+            graficos = visualizaciones(cobrador)
+        with medicion.etapa("jinja"):
+            html = render_tarjeta(plantilla, cobrador, filas, foto=foto, visualizaciones=graficos)
+        medicion.bytes("jinja", html)
+        yield html
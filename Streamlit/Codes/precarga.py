@@ -0,0 +1,127 @@
+# precarga.py
+"""
+Precarga de cachés antes de que llegue el primer usuario.
+
+Hace por adelantado, fuera de las peticiones, el trabajo caro del primer
+render de la semana que queda en disco y el servidor reutiliza:
+
+- libro:      Excel -> Parquet (ingesta.py), si el caché no está vigente
+- plantillas: compilación de tarjeta.html (caché de bytecode de Jinja)
+- fotos:      base64 de las fotos (blobs de CacheActivos) o copia a 'static'
+- graficas:   lo mismo para los PNG de Visuals.py de la semana
+- limpieza:   borra los blobs o las copias en 'static' de imágenes que ya no se muestran
+
+El índice de semanas y los agregados viven en la memoria del proceso de
+Streamlit, así que no se pueden precalentar desde aquí: los arma la primera
+visita, ya sobre el Parquet y sin leer el Excel.
+
+Al final imprime cuánto tardó cada etapa (con ONEPAGE_MEDICION=json también
+la agrega al log de medicion.py). Con --arrancar, después de precargar
+inicia el servidor (streamlit run OnePage.py) con el mismo libro, semana de
+gráficas y modo de imágenes.
+
+Uso:
+    python precarga.py [--libro RUTA] [--semana 2025Sem43] [--modo-imagenes base64|static] [--arrancar]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from activos import CARPETA_CACHE_ACTIVOS, CARPETA_STATIC, CacheActivos, PublicadorEstatico, clave_activo
+from configuracion import CONFIG
+from esquema import etiqueta_semana
+from ingesta import PARQUET_DISPONIBLE, cache_vigente, construir_cache
+from medicion import MODO_MEDICION, Medicion
+from preparacion import RUTA_LIBRO, abrir_indice, rutas_visualizaciones, semana_graficas
+from tarjetas import CARPETA_PLANTILLAS, entorno_plantillas
+
+
+def calentar_imagenes(rutas, modo_imagenes):
+    """Codifica (base64) o publica (static) las imágenes existentes. Devuelve sus llaves."""
+    claves = [c for c in map(clave_activo, rutas) if c]
+    if modo_imagenes == "static":
+        publicador = PublicadorEstatico(CARPETA_STATIC)
+        for clave in claves:
+            publicador.url(clave)
+    else:
+        cache = CacheActivos(max_items=1, carpeta=CARPETA_CACHE_ACTIVOS)
+        for clave in claves:
+            cache.resolver(clave)
+    return claves
+
+
+def calentar(ruta_libro, semana=None, modo_imagenes="base64", semanas=4):
+    """
+    Corre todas las etapas; devuelve la Medicion (detalle de cada etapa en "texto").
+
+    - semana: carpeta de gráficas (default: la de la última semana de los datos)
+    """
+    medicion = Medicion(script="precarga")
+
+    with medicion.etapa("libro") as detalle:
+        if not PARQUET_DISPONIBLE:
+            detalle["texto"] = "sin pyarrow: se lee el Excel en cada arranque"
+        elif cache_vigente(ruta_libro):
+            detalle["texto"] = "Parquet vigente"
+        else:
+            construir_cache(ruta_libro)
+            detalle["texto"] = "Excel -> Parquet"
+
+    with medicion.etapa("plantillas"):
+        entorno_plantillas(CARPETA_PLANTILLAS).get_template("tarjeta.html")
+
+    # Sólo para saber qué imágenes pide la primera visita: cobradores y semana del rango por defecto
+    indice = abrir_indice(ruta_libro)
+    desde, hasta = indice.ultimas(semanas)
+    datos = indice.rango(desde, hasta)
+    semana = semana or semana_graficas(hasta)
+    cobradores = datos.cobradores.loc[datos.hechos["cobrador_id"].unique()]
+
+    with medicion.etapa("fotos") as detalle:
+        fotos = calentar_imagenes(cobradores["foto"], modo_imagenes)
+        detalle["texto"] = (f"{len(fotos)} de {len(cobradores)} de {etiqueta_semana(desde)}-{etiqueta_semana(hasta)} "
+                            f"({modo_imagenes})")
+
+    with medicion.etapa("graficas") as detalle:
+        rutas = [ruta for nombre in cobradores["nombre_junto"] for ruta in rutas_visualizaciones(nombre, semana)]
+        graficas = calentar_imagenes(rutas, modo_imagenes)
+        detalle["texto"] = f"{len(graficas)} de {len(rutas)} en {semana} ({modo_imagenes})"
+
+    with medicion.etapa("limpieza") as detalle:
+        if modo_imagenes == "static":
+            n = PublicadorEstatico(CARPETA_STATIC).podar(fotos + graficas)
+            detalle["texto"] = f"{n} imágenes de 'static' de otras versiones o semanas"
+        else:
+            n = CacheActivos(max_items=1, carpeta=CARPETA_CACHE_ACTIVOS).podar(fotos + graficas)
+            detalle["texto"] = f"{n} blobs de otras versiones o semanas"
+
+    return medicion
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Llena los cachés del dashboard para la semana actual.")
+    parser.add_argument("--libro", default=RUTA_LIBRO, help="libro semanal (.xlsx)")
+    parser.add_argument("--semana", default=None,
+                        help="carpeta de gráficas, p. ej. 2025Sem43 (default: la de la última semana de los datos)")
+    parser.add_argument("--modo-imagenes", choices=["base64", "static"],
+                        default=CONFIG.modo_imagenes,
+                        help="igual que ONEPAGE_MODO_IMAGENES del dashboard")
+    parser.add_argument("--arrancar", action="store_true",
+                        help="al terminar, inicia 'streamlit run OnePage.py' con el mismo libro, semana y modo")
+    args = parser.parse_args()
+
+    medicion = calentar(args.libro, args.semana, args.modo_imagenes)
+    medicion.imprimir()
+    if "json" in MODO_MEDICION:
+        medicion.escribir_json()
+
+    if args.arrancar:
+        pagina = os.path.join(os.path.dirname(os.path.abspath(__file__)), "OnePage.py")
+        # Lo mismo que se precargó; sin --semana el servidor sigue tomando la de los datos
+        entorno = dict(os.environ, ONEPAGE_LIBRO=os.path.abspath(args.libro),
+                       ONEPAGE_MODO_IMAGENES=args.modo_imagenes)
+        if args.semana:
+            entorno["ONEPAGE_SEMANA"] = args.semana
+        sys.exit(subprocess.call([sys.executable, "-m", "streamlit", "run", pagina], env=entorno,
+                                 cwd=os.path.dirname(pagina)))
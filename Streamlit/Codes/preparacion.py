@@ -0,0 +1,88 @@
+# preparacion.py
+"""
+Preparación de los datos 'one_page' y rutas de los activos de cada cobrador.
+
+Es lo que hace load_data sin depender de Streamlit, para que la página, la
+precarga (precarga.py) y los scripts por lotes preparen y elijan los datos
+(almacén o libro semanal) igual.
+"""
+from almacen import AlmacenSemanal
+from configuracion import CONFIG
+from esquema import Datos, aplicar_esquema, claves_semana, etiqueta_semana, normalizar
+from indices import IndiceSemanas
+from ingesta import leer_hoja
+
+# Libro semanal de respaldo cuando el almacén (python almacen.py <archivo>) está vacío
+RUTA_LIBRO = CONFIG.libro
+CARPETA_FOTOS = CONFIG.fotos
+CARPETA_VISUALIZACIONES = CONFIG.visualizaciones
+TIPOS_GRAFICO = ["dictamen", "pagoscumpli"]
+
+
+def ruta_foto(nombre_junto):
+    return f"{CARPETA_FOTOS}/{nombre_junto}Pic.png"
+
+
+def semana_graficas(clave):
+    """
+    Carpeta de Visualizations de una semana de los datos: 202543 -> '2025Sem43'.
+
+    Es la única fuente de la semana activa del dashboard, de Visuals.py y de los
+    scripts: sale de las columnas 'anio' y 'semana' de los datos (el año lo fija
+    la ingesta, ver ingesta.agregar_anio), nunca del reloj. El ajuste 'semana'
+    la fija para todo.
+    """
+    if CONFIG.semana:
+        return CONFIG.semana
+    return etiqueta_semana(clave)
+
+
+def rutas_visualizaciones(nombre, semana):
+    """PNG de Visuals.py del cobrador ('nombre' sin espacios) para la carpeta de la semana."""
+    return [f"{CARPETA_VISUALIZACIONES}/{semana}/{nombre}_{tipo}.png" for tipo in TIPOS_GRAFICO]
+
+
+def preparar_datos(df):
+    """Hoja 'one_page' -> esquema.Datos(cobradores, hechos) con tipos compactos (valida la hoja)."""
+    df = df.fillna(0)
+    df.rename(columns={"meta": "logros_meta"}, inplace=True)
+    # Una fila por cobrador (nombre y foto) + hechos semanales (con el perfil de cada semana) por cobrador_id
+    cobradores, hechos = normalizar(df)
+    if "motos" in hechos.columns:
+        # Se convierte cada valor distinto una vez, no cada fila
+        motos = {x: int(x.split()[1]) if isinstance(x, str) and len(x.split()) > 1 else None for x in hechos["motos"].unique()}
+        hechos["motos"] = hechos["motos"].map(motos)
+    cobradores["nombre_junto"] = cobradores["nombre"].str.replace(" ", "", regex=False)
+    # Sólo la ruta: la llave del activo (ruta + mtime + tamaño) se toma al renderizar,
+    # así una foto reemplazada se ve sin recargar el libro
+    cobradores["foto"] = cobradores["nombre_junto"].map(ruta_foto)
+    # Categorías y enteros chicos
+    return aplicar_esquema(Datos(cobradores, hechos))
+
+
+def cargar_libro(ruta_libro):
+    return preparar_datos(leer_hoja(ruta_libro, "one_page"))
+
+
+def abrir_indice(ruta_libro=RUTA_LIBRO, cargar=cargar_libro):
+    """
+    Índice por semana de los datos preparados: el almacén particionado si tiene
+    semanas; si no, los hechos del libro semanal leídos con cargar(ruta_libro).
+    """
+    almacen = AlmacenSemanal(preparar=preparar_datos)
+    if almacen.semanas:
+        return almacen
+    return IndiceSemanas(cargar(ruta_libro), fuentes=[ruta_libro])
+
+
+def hoja_graficas(ruta_libro, semana):
+    """
+    Hoja 'graficas' de la semana (clave) desde el almacén; si no está, las filas
+    de esa semana en el libro semanal. Sin la semana devuelve una tabla vacía
+    (sin gráficas), igual que las PNG cuando falta su carpeta.
+    """
+    almacen = AlmacenSemanal(hoja="graficas")
+    if semana in almacen.semanas:
+        return almacen.rango(semana, semana)
+    hoja = leer_hoja(ruta_libro, "graficas")
+    return hoja[claves_semana(hoja) == semana].reset_index(drop=True)
@@ -0,0 +1,303 @@
+# rendimiento.py
+"""
+Banco de pruebas de rendimiento del pipeline One Page con plantillas sintéticas.
+
+Para cada tamaño de plantilla (por defecto 10, 100, 1,000 y 10,000 cobradores)
+genera en una carpeta temporal un libro semanal con las hojas 'one_page' y
+'graficas' (N semanas por cobrador) y una foto de prueba por cobrador, y mide
+por separado cada etapa:
+
+- excel:           lectura del .xlsx y escritura del caché Parquet (ingesta.py)
+- parquet:         lectura de 'one_page' desde el caché
+- preparacion:     validación, esquema y tipos compactos (preparar_datos)
+- agregados:       promedios y ranking de las últimas 4 semanas
+- fotos:           base64 de todas las fotos con el caché en frío
+- graficas_svg:    SVG de la hoja 'graficas' (graficos_por_cobrador)
+- tarjetas:        HTML de todas las tarjetas (medallas + Jinja) con fotos en caché
+- visuals_datos:   carga de la hoja 'graficas' de Visuals.py
+- visuals:         PNG de Visuals.py para una muestra de cobradores (--max-graficas)
+
+Cada etapa se corre --repeticiones veces sólo con el reloj y una vez más con
+tracemalloc para el pico de memoria (lo que asigna Python/numpy; la memoria
+interna de pyarrow no se cuenta). Los resultados se escriben en JSON y, con
+--comparar, se imprimen contra una corrida anterior.
+
+Las tarjetas se arman con las plantillas reales (CARPETA_PLANTILLAS).
+
+Uso:
+    python rendimiento.py [--tamanos 10 100 1000 10000] [--semanas 8] [--repeticiones 3]
+                          [--max-graficas 50] [--salida ARCHIVO.json] [--comparar ANTERIOR.json]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+import ingesta
+import preparacion
+import Visuals
+from activos import CacheActivos, clave_activo
+from configuracion import CONFIG
+from graficos_svg import graficos_por_cobrador, llave_cobrador
+from indices import IndiceSemanas
+from ingesta import construir_cache, leer_hoja
+from pagina import tarjetas_html
+from tarjetas import CARPETA_PLANTILLAS, construir_datos_tarjetas, entorno_plantillas
+
+CARPETA_RESULTADOS = CONFIG.resultados
+TAMANOS = [10, 100, 1000, 10000]
+ZONAS = [f"Zona {i:02d}" for i in range(1, 26)]
+# Uno de cada diez cobradores sin foto, como en la plantilla real
+SIN_FOTO = 10
+# Año de las semanas sintéticas (columna 'anio': no depende de la fecha del libro)
+ANIO = 2025
+
+
+# ---------- Datos sintéticos ----------
+
+def nombres_sinteticos(n):
+    return [f"Cobrador {i:05d} Sintetico" for i in range(n)]
+
+
+def hoja_one_page(nombres, semanas, rng):
+    n, s = len(nombres), len(semanas)
+    filas = n * s
+    plantilla_general = rng.integers(3, 15, n)
+    df = pd.DataFrame({
+        "nombre": np.repeat(nombres, s),
+        "zona": np.repeat([ZONAS[i % len(ZONAS)] for i in range(n)], s),
+        "experiencia": np.repeat([f"{a} años en cobranza, {a // 2} en Fincomun" for a in rng.integers(1, 20, n)], s),
+        "motos": np.repeat([f"Motos: {m}" for m in rng.integers(0, 6, n)], s),
+        "anio": ANIO,
+        "semana": np.tile(semanas, n),
+        "plantilla_general": np.repeat(plantilla_general, s),
+        "plantilla": rng.integers(5, 11, filas) / 10,
+        "horas_visita": rng.uniform(5, 10, filas),
+        "segundos": rng.uniform(18000, 36000, filas),
+        "visitas_totales": rng.integers(300, 600, filas).astype(float),
+        "visitas": rng.integers(5, 25, filas).astype(float),
+        "contacto": rng.uniform(0.4, 0.9, filas),
+        "promesas_contacto": rng.uniform(0.3, 0.95, filas),
+        "promesas_cumplidas": rng.uniform(0.3, 0.8, filas),
+        "monto": rng.uniform(100000, 300000, filas).round(2),
+        "meta": rng.uniform(0.5, 1.2, filas),
+    })
+    # La hoja real trae 'meta' vacía en algunas semanas
+    df.loc[rng.random(filas) < 0.3, "meta"] = np.nan
+    return df
+
+
+def hoja_graficas(nombres, semana, rng):
+    n = len(nombres)
+    df = pd.DataFrame({
+        "nombre": nombres,
+        "Negativa Fraude": rng.integers(10, 60, n),
+        "No localizado": rng.integers(50, 150, n),
+        "Promesas": rng.integers(200, 400, n),
+        "Vía de solución": rng.integers(0, 25, n),
+        "anio": ANIO,
+        "semana": semana,
+        "n_reestructuras": rng.integers(0, 4, n).astype(float),
+        "monto_reestructuras": rng.uniform(0, 200000, n).round(2),
+        "liquidados": rng.integers(0, 6, n).astype(float),
+        "pago_parcial": rng.integers(50, 150, n),
+        "al_coriente": rng.integers(30, 110, n),
+    })
+    df.loc[df["n_reestructuras"] == 0, ["n_reestructuras", "monto_reestructuras"]] = np.nan
+    return df
+
+
+def fotos_prueba(colores=16):
+    """PNG de 72x72 de distintos colores (bytes) para repartir entre los cobradores."""
+    fotos = []
+    for i in range(colores):
+        buffer = io.BytesIO()
+        Image.new("RGB", (72, 72), (16 * i, 255 - 16 * i, 128)).save(buffer, format="PNG")
+        fotos.append(buffer.getvalue())
+    return fotos
+
+
+def generar_plantilla(carpeta, n, semanas, semilla=0):
+    """Libro semanal y fotos de n cobradores en 'carpeta'. Devuelve la ruta del libro."""
+    rng = np.random.default_rng(semilla)
+    nombres = nombres_sinteticos(n)
+    semanas = list(range(44 - semanas, 44))
+
+    ruta_libro = os.path.join(carpeta, f"op_sintetico_{n}.xlsx")
+    with pd.ExcelWriter(ruta_libro, engine="openpyxl") as libro:
+        hoja_one_page(nombres, semanas, rng).to_excel(libro, sheet_name="one_page", index=False)
+        hoja_graficas(nombres, semanas[-1], rng).to_excel(libro, sheet_name="graficas", index=False)
+
+    carpeta_fotos = os.path.join(carpeta, "Photos")
+    os.makedirs(carpeta_fotos)
+    fotos = fotos_prueba()
+    for i, nombre in enumerate(nombres):
+        if i % SIN_FOTO:
+            with open(os.path.join(carpeta_fotos, f"{nombre.replace(' ', '')}Pic.png"), "wb") as f:
+                f.write(fotos[i % len(fotos)])
+    return ruta_libro
+
+
+# ---------- Medición ----------
+
+def medir(funcion, repeticiones):
+    """Corre funcion() 'repeticiones' veces con reloj y una más con tracemalloc. Devuelve (resultado, medida)."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        resultado = funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    medida = {
+        "segundos": min(tiempos),
+        "mediana": statistics.median(tiempos),
+        "tiempos": tiempos,
+        "pico_mb": pico / 2 ** 20,
+    }
+    return resultado, medida
+
+
+def correr_tamano(n, semanas, repeticiones, max_graficas, semilla=0):
+    """Genera la plantilla de n cobradores y mide cada etapa. Devuelve el dict de resultados."""
+    etapas = {}
+    with tempfile.TemporaryDirectory(prefix=f"onepage_{n}_") as carpeta:
+        inicio = time.perf_counter()
+        ruta_libro = generar_plantilla(carpeta, n, semanas, semilla)
+        generacion = time.perf_counter() - inicio
+
+        # Las rutas de fotos y gráficas y el Parquet del libro se resuelven contra la carpeta temporal
+        originales = preparacion.CARPETA_FOTOS, preparacion.CARPETA_VISUALIZACIONES, ingesta.CARPETA_CACHE
+        preparacion.CARPETA_FOTOS = os.path.join(carpeta, "Photos")
+        preparacion.CARPETA_VISUALIZACIONES = os.path.join(carpeta, "Visualizations")
+        ingesta.CARPETA_CACHE = os.path.join(carpeta, "cache")
+        try:
+            _, etapas["excel"] = medir(lambda: construir_cache(ruta_libro), repeticiones)
+            df, etapas["parquet"] = medir(lambda: leer_hoja(ruta_libro, "one_page"), repeticiones)
+            datos, etapas["preparacion"] = medir(lambda: preparacion.preparar_datos(df.copy()), repeticiones)
+
+            indice = IndiceSemanas(datos, fuentes=[ruta_libro])
+            desde, hasta = indice.ultimas(4)
+            (semanal, resumen), etapas["agregados"] = medir(
+                lambda: construir_datos_tarjetas(indice.rango(desde, hasta)), repeticiones
+            )
+
+            def codificar_fotos():
+                activos = CacheActivos(max_items=len(resumen) + 1)
+                for foto in resumen["foto"]:
+                    activos.resolver(clave_activo(foto))
+                return activos
+            activos, etapas["fotos"] = medir(codificar_fotos, repeticiones)
+
+            graficas = leer_hoja(ruta_libro, "graficas")
+            svgs, etapas["graficas_svg"] = medir(lambda: graficos_por_cobrador(graficas), repeticiones)
+
+            plantilla = entorno_plantillas(CARPETA_PLANTILLAS).get_template("tarjeta.html")
+
+            def render_tarjetas():
+                return [
+                    len(html.encode("utf-8"))
+                    for html in tarjetas_html(plantilla, semanal, resumen, 0, len(resumen), activos.resolver,
+                                              lambda cobrador: svgs.get(llave_cobrador(cobrador.Index), ""))
+                ]
+            tamanos, etapas["tarjetas"] = medir(render_tarjetas, repeticiones)
+            etapas["tarjetas"].update(bytes_total=sum(tamanos), bytes_por_tarjeta=sum(tamanos) / len(tamanos))
+
+            df_visuals, etapas["visuals_datos"] = medir(lambda: Visuals.cargar_graficas(ruta_libro), repeticiones)
+            muestra = list(zip(df_visuals["nombre"], df_visuals["dictamen"], df_visuals["pagos_cumplidos"]))
+            muestra = muestra[:max_graficas]
+            carpeta_png = os.path.join(carpeta, "Visualizations", "sintetica")
+            os.makedirs(carpeta_png)
+            _, etapas["visuals"] = medir(lambda: Visuals.render_todos(muestra, carpeta_png, 1), repeticiones)
+            etapas["visuals"].update(cobradores=len(muestra),
+                                     segundos_por_cobrador=etapas["visuals"]["segundos"] / max(1, len(muestra)))
+        finally:
+            preparacion.CARPETA_FOTOS, preparacion.CARPETA_VISUALIZACIONES, ingesta.CARPETA_CACHE = originales
+
+    return {
+        "cobradores": n,
+        "semanas": semanas,
+        "filas": n * semanas,
+        "generacion_s": generacion,
+        "etapas": etapas,
+    }
+
+
+# ---------- Reporte ----------
+
+def imprimir_resultados(resultados, anterior=None):
+    """Tabla por tamaño y etapa; con 'anterior' agrega la razón contra esa corrida (>1 = más lento)."""
+    previos = {}
+    for r in (anterior or {}).get("resultados", []):
+        for etapa, medida in r["etapas"].items():
+            previos[(r["cobradores"], etapa)] = medida
+    for r in resultados:
+        print(f"\n{r['cobradores']:,} cobradores x {r['semanas']} semanas ({r['filas']:,} filas)")
+        for etapa, medida in r["etapas"].items():
+            linea = f"  {etapa:<14} {medida['segundos']:9.3f} s  {medida['pico_mb']:9.1f} MB"
+            previo = previos.get((r["cobradores"], etapa))
+            if previo and previo["segundos"] > 0:
+                linea += f"  x{medida['segundos'] / previo['segundos']:.2f} tiempo" \
+                         f"  x{medida['pico_mb'] / max(previo['pico_mb'], 1e-9):.2f} memoria"
+            print(linea)
+
+
+def entorno_corrida():
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide cada etapa del pipeline One Page con plantillas sintéticas.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS, help="cobradores por plantilla")
+    parser.add_argument("--semanas", type=int, default=8, help="semanas por cobrador")
+    parser.add_argument("--repeticiones", type=int, default=3, help="corridas cronometradas por etapa")
+    parser.add_argument("--max-graficas", type=int, default=50,
+                        help="cobradores a dibujar con Visuals.py (400 dpi es lento)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default=None,
+                        help=f"archivo JSON (default: {CARPETA_RESULTADOS}/rendimiento_<fecha>.json)")
+    parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior")
+    args = parser.parse_args()
+
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            anterior = json.load(f)
+
+    resultados = []
+    for n in args.tamanos:
+        print(f"{n:,} cobradores...", flush=True)
+        resultados.append(correr_tamano(n, args.semanas, args.repeticiones, args.max_graficas, args.semilla))
+
+    salida = args.salida or os.path.join(
+        CARPETA_RESULTADOS, f"rendimiento_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump({"entorno": entorno_corrida(), "repeticiones": args.repeticiones, "resultados": resultados},
+                  f, indent=2, ensure_ascii=False)
+
+    imprimir_resultados(resultados, anterior)
+    print(f"\nResultados en {salida}")
@@ -0,0 +1,188 @@
+# tarjetas.py
+"""
+Datos de las tarjetas de cobradores.
+
+Toda la agregación que necesitan las tarjetas (filas semanales por cobrador,
+promedios del resumen, última plantilla y ranking) se hace en una sola
+pasada sobre la tabla de hechos: un ordenamiento por cobrador/año/semana y un
+único groupby. El perfil (zona, experiencia, motos) es el de la primera semana
+de cada cobrador en el rango (perfil_del_rango) y el nombre y la foto se unen
+desde la tabla de cobradores (esquema.py).
+Cada cobrador queda como un rango contiguo [inicio, fin) del DataFrame
+ordenado, así que armar las tarjetas es lineal en el número de filas.
+
+Las celdas de las filas semanales se formatean por columna completa (una
+vez para todo el DataFrame) y el marcado vive en las macros Jinja de
+Resources/Templates/macros.html; cada tarjeta se genera con un solo
+'render' de tarjeta.html. Las plantillas se compilan una vez por proceso.
+"""
+import functools
+import os
+from collections import namedtuple
+
+import numpy as np
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from configuracion import CONFIG
+from esquema import COLUMNAS_PERFIL
+from medallas import clasificar_medallas
+
+CARPETA_PLANTILLAS = CONFIG.plantillas
+
+# Columnas que se promedian en la fila de resumen de cada tarjeta
+COLUMNAS_PROMEDIO = [
+    "horas_visita",
+    "visitas_totales",
+    "contacto",
+    "promesas_contacto",
+    "promesas_cumplidas",
+    "monto",
+    "logros_meta",
+]
+
+# Medallas de las filas semanales: columna de datos -> tipo de regla
+COLUMNAS_MEDALLA = {
+    "plantilla": "plantilla",
+    "visitas": "visitas",
+    "contacto": "contacto",
+    "promesas_contacto": "contacto",
+    "promesas_cumplidas": "promesas_cumplidas",
+    "logros_meta": "logro_meta",
+}
+
+# Celdas ya formateadas de una fila semanal (lo que consume la macro fila_semana)
+Fila = namedtuple("Fila", ["semana", "horas_visita", "visitas_totales", "monto"] + [
+    f"{col}_{parte}" for col in COLUMNAS_MEDALLA for parte in ("color", "texto")
+])
+
+
+@functools.lru_cache(maxsize=None)
+def entorno_plantillas(carpeta):
+    """Environment de Jinja sobre la carpeta de plantillas, con caché de bytecode en CONFIG.cache."""
+    carpeta_cache = os.path.join(CONFIG.cache, "jinja")
+    os.makedirs(carpeta_cache, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(carpeta),
+        bytecode_cache=FileSystemBytecodeCache(carpeta_cache),
+        auto_reload=False,
+    )
+
+
+def construir_datos_tarjetas(datos):
+    """
+    Agrega los hechos filtrados para todas las tarjetas a la vez.
+
+    - datos: esquema.Datos(cobradores, hechos)
+
+    Devuelve:
+    - semanal: hechos ordenados por cobrador_id (nombre), año y semana (índice 0..n-1)
+    - resumen: ver completar_resumen.
+    """
+    cobradores, hechos = datos
+    semanal = hechos.sort_values(by=["cobrador_id", "anio", "semana"], kind="stable").reset_index(drop=True)
+    grupos = semanal.groupby("cobrador_id", sort=False)
+
+    columnas = [c for c in COLUMNAS_PROMEDIO if c in semanal.columns]
+    resumen = grupos[columnas].mean()
+    for col in COLUMNAS_PROMEDIO:
+        if col not in resumen.columns:
+            resumen[col] = 0
+    resumen["plantilla"] = grupos["plantilla_general"].last()
+    return semanal, completar_resumen(resumen.join(perfil_del_rango(semanal)), grupos.size(), cobradores)
+
+
+def perfil_del_rango(semanal):
+    """
+    Perfil de cada cobrador en su primera semana del rango, indexado por cobrador_id.
+
+    - semanal: hechos del rango con las semanas de cada cobrador en orden (año, semana)
+    """
+    columnas = [col for col in COLUMNAS_PERFIL if col in semanal.columns]
+    return semanal.drop_duplicates("cobrador_id").set_index("cobrador_id")[columnas]
+
+
+def completar_resumen(resumen, tamanos, cobradores):
+    """
+    Une los promedios y el perfil por cobrador_id (en el orden de 'semanal') con la tabla de cobradores.
+
+    Devuelve una fila por cobrador, indexada por nombre y ya en orden de ranking
+    (promedio de logros_meta descendente), con los promedios, la última
+    plantilla_general, el perfil (zona, experiencia, motos, foto...) y las
+    posiciones 'inicio'/'fin' de sus filas en 'semanal'.
+    """
+    resumen["fin"] = tamanos.cumsum()
+    resumen["inicio"] = resumen["fin"] - tamanos
+    resumen = resumen.join(cobradores).set_index("nombre")
+
+    # Ranking: promedio de logros_meta (sin filas, 0)
+    resumen["promedio"] = resumen["logros_meta"].fillna(0)
+    return resumen.sort_values("promedio", ascending=False, kind="stable")
+
+
+def pagina_tarjetas(semanal, resumen, desde, hasta):
+    """
+    Sólo las tarjetas de las posiciones [desde, hasta) del ranking.
+
+    Se formatean únicamente las filas semanales de esos cobradores (en un solo
+    llamado a formatear_filas) y se devuelve, por cobrador:
+    (fila de resumen, celdas formateadas).
+    """
+    pagina = resumen.iloc[desde:hasta]
+    if pagina.empty:
+        return
+    posiciones = np.concatenate([np.arange(a, b) for a, b in zip(pagina["inicio"], pagina["fin"])])
+    filas = formatear_filas(semanal.iloc[posiciones])
+    offset = 0
+    for cobrador in pagina.itertuples():
+        n = cobrador.fin - cobrador.inicio
+        yield cobrador, filas[offset:offset + n]
+        offset += n
+
+
+def _montos(valores):
+    v = np.asarray(valores, dtype=float)
+    nulos = np.isnan(v)
+    enteros = np.trunc(np.where(nulos, 0, v)).astype(np.int64).tolist()
+    return np.array(["-" if nulo else f"${x:,}" for x, nulo in zip(enteros, nulos)], dtype=object)
+
+
+def formatear_filas(semanal):
+    """
+    Formatea las celdas de todas las filas de 'semanal' por columna completa.
+
+    Devuelve una lista de Fila alineada con 'semanal'; las filas de un
+    cobrador son filas[inicio:fin].
+    """
+    columnas = {
+        "semana": semanal["semana"].astype(str).to_numpy(dtype=object),
+        "horas_visita": np.char.mod("%.1f", semanal["horas_visita"].to_numpy(dtype=float)),
+        "visitas_totales": np.char.mod("%.0f", semanal["visitas_totales"].to_numpy(dtype=float)),
+        "monto": _montos(semanal["monto"]),
+    }
+    for col, tipo in COLUMNAS_MEDALLA.items():
+        columnas[f"{col}_color"], columnas[f"{col}_texto"] = clasificar_medallas(semanal[col], tipo)
+    return list(map(Fila._make, zip(*(columnas[campo].tolist() for campo in Fila._fields))))
+
+
+def render_tarjeta(plantilla, cobrador, filas, foto="", visualizaciones=""):
+    """
+    HTML completo de una tarjeta en una sola llamada a 'render'.
+
+    - plantilla: tarjeta.html obtenida de entorno_plantillas
+    - cobrador: fila de 'resumen' (promedios y perfil del cobrador)
+    - filas: celdas formateadas del cobrador (formatear_filas()[inicio:fin])
+    - foto: URL o data URI ya resuelto de la foto ('' muestra la inicial)
+    """
+    dictamen_pct = min(int((cobrador.monto / max(cobrador.monto, 1)) * 80) + 20, 100)  # ejemplo entre 20 y 100
+    return plantilla.render(
+        nombre=cobrador.Index,
+        zona=str(cobrador.zona),
+        experiencia=str(getattr(cobrador, "experiencia", "")),
+        motos=str(getattr(cobrador, "motos", "")),
+        promedio=f"{cobrador.promedio:.1f}",
+        dictamen=str(dictamen_pct),
+        foto=foto.strip() if isinstance(foto, str) else "",
+        resumen=cobrador,
+        filas=filas,
+        visualizaciones=visualizaciones,
+    )
@@ -0,0 +1,78 @@
+# test_almacen.py
+"""
+El almacén sólo agrega semanas (salvo con --reemplazar), separa por año las
+semanas con el mismo número y migra las particiones semana=N del formato
+anterior a anio=A/semana=N.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from almacen import ARCHIVO_PARTICION, AlmacenSemanal, agregar_archivo, migrar_particiones
+
+
+def archivo_semanal(carpeta, nombre, semanas, valor=1.0):
+    """CSV 'one_page' mínimo: dos cobradores por semana; 'valor' marca de qué archivo salió la fila."""
+    filas = [
+        {"nombre": nombre_cobrador, "zona": "Norte", "semana": semana, "logros_meta": valor}
+        for semana in semanas for nombre_cobrador in ("Ana", "Beto")
+    ]
+    ruta = os.path.join(carpeta, nombre)
+    pd.DataFrame(filas).to_csv(ruta, index=False)
+    return ruta
+
+
+def test_solo_agrega(tmp_path):
+    almacen = str(tmp_path / "almacen")
+    primero = archivo_semanal(tmp_path, "one_page_2025_a.csv", [42, 43], valor=1.0)
+    segundo = archivo_semanal(tmp_path, "one_page_2025_b.csv", [43, 44], valor=2.0)
+
+    assert agregar_archivo(primero, almacen) == {"one_page": ([202542, 202543], [])}
+    assert agregar_archivo(segundo, almacen) == {"one_page": ([202544], [202543])}
+
+    indice = AlmacenSemanal(almacen)
+    assert indice.semanas == [202542, 202543, 202544]
+    # La semana repetida conserva las filas del primer archivo
+    assert indice.rango(202543, 202543)["logros_meta"].tolist() == [1.0, 1.0]
+    assert indice.ultimas(2) == (202543, 202544)
+
+
+def test_reemplazar(tmp_path):
+    almacen = str(tmp_path / "almacen")
+    agregar_archivo(archivo_semanal(tmp_path, "one_page_2025_a.csv", [43], valor=1.0), almacen)
+    corregido = archivo_semanal(tmp_path, "one_page_2025_b.csv", [43], valor=2.0)
+
+    assert agregar_archivo(corregido, almacen, reemplazar=True) == {"one_page": ([202543], [])}
+    assert AlmacenSemanal(almacen).rango(202543, 202543)["logros_meta"].tolist() == [2.0, 2.0]
+    assert not any(nombre.endswith(".tmp") for _, carpetas, _ in os.walk(almacen) for nombre in carpetas)
+
+
+def test_misma_semana_de_otro_anio(tmp_path):
+    almacen = str(tmp_path / "almacen")
+    agregar_archivo(archivo_semanal(tmp_path, "one_page_2025.csv", [43], valor=1.0), almacen)
+    agregar_archivo(archivo_semanal(tmp_path, "one_page_sem43.csv", [43], valor=2.0), almacen, anio=2026)
+
+    indice = AlmacenSemanal(almacen)
+    assert indice.semanas == [202543, 202643]
+    assert indice.rango(202643, 202643)["logros_meta"].tolist() == [2.0, 2.0]
+    assert set(indice.rango(202543, 202643)["anio"]) == {2025, 2026}
+
+
+def test_migrar(tmp_path):
+    almacen = tmp_path / "almacen"
+    # Formato anterior: one_page/semana=N/datos.parquet, sin columna 'anio'; cruza el fin de año
+    for semana in (51, 52, 1):
+        carpeta = almacen / "one_page" / f"semana={semana}"
+        carpeta.mkdir(parents=True)
+        pd.DataFrame({"nombre": ["Ana"], "zona": ["Norte"], "semana": [semana], "logros_meta": [0.5]}).to_parquet(
+            carpeta / ARCHIVO_PARTICION, index=False
+        )
+    with pytest.raises(RuntimeError, match="--migrar"):
+        AlmacenSemanal(str(almacen)).semanas
+
+    assert migrar_particiones(str(almacen), 2026) == {"one_page": [202551, 202552, 202601]}
+    indice = AlmacenSemanal(str(almacen))
+    assert indice.semanas == [202551, 202552, 202601]
+    assert indice.rango(202551, 202601)["anio"].tolist() == [2025, 2025, 2026]
+    assert not any(nombre.startswith("semana=") for nombre in os.listdir(almacen / "one_page"))
@@ -0,0 +1,27 @@
+# test_configuracion.py
+"""
+Un archivo de configuración indicado en ONEPAGE_CONFIG tiene que existir;
+onepage.toml junto a los códigos es opcional.
+"""
+import pytest
+
+import configuracion
+from configuracion import RAIZ_INSTALACION, cargar_configuracion
+
+
+def test_archivo_indicado_inexistente(tmp_path):
+    with pytest.raises(FileNotFoundError, match="onepage.tmol"):
+        cargar_configuracion(entorno={"ONEPAGE_CONFIG": str(tmp_path / "onepage.tmol")})
+
+
+def test_archivo_indicado(tmp_path):
+    ruta = tmp_path / "onepage.toml"
+    ruta.write_text('raiz = "/srv/cobranza"\nmodo_imagenes = "static"\n', encoding="utf-8")
+    config = cargar_configuracion(entorno={"ONEPAGE_CONFIG": str(ruta)})
+    assert (config.libro, config.modo_imagenes) == ("/srv/cobranza/Resources/Data/op_sl_sem43.xlsx", "static")
+
+
+def test_sin_archivo_implicito(monkeypatch, tmp_path):
+    monkeypatch.setattr(configuracion, "ARCHIVO_CONFIG", str(tmp_path / "onepage.toml"))
+    config = cargar_configuracion(entorno={})
+    assert (config.raiz, config.modo_imagenes) == (RAIZ_INSTALACION, "base64")
@@ -0,0 +1,90 @@
+# test_huellas.py
+"""
+Un resultado memorizado con cache_por_huella se recalcula cuando cambia la
+fecha o el tamaño de una de sus fuentes, y invalidar(ruta) lo descarta.
+"""
+import os
+
+import pytest
+
+import huellas
+from huellas import cache_por_huella
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    """Función que lee el archivo pedido y cuenta cuántas veces se ejecutó, con un registro limpio."""
+    monkeypatch.setattr(huellas, "REGISTRO", {})
+    llamadas = []
+
+    @cache_por_huella(fuentes=lambda path: [path])
+    def leer(path):
+        llamadas.append(path)
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def escribir(nombre, texto, mtime_ns=None):
+        ruta = str(tmp_path / nombre)
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(texto)
+        if mtime_ns is not None:
+            os.utime(ruta, ns=(mtime_ns, mtime_ns))
+        return ruta
+
+    return leer, llamadas, escribir
+
+
+def test_acierto_sin_cambios(cache):
+    leer, llamadas, escribir = cache
+    ruta = escribir("a.txt", "uno", mtime_ns=10 ** 18)
+    assert leer(ruta) == leer(ruta) == "uno"
+    assert len(llamadas) == 1
+    assert leer.estadisticas() == {"aciertos": 1, "fallos": 1, "entradas": 1}
+
+
+def test_recalcula_si_cambia_la_fecha(cache):
+    leer, llamadas, escribir = cache
+    ruta = escribir("a.txt", "uno", mtime_ns=10 ** 18)
+    leer(ruta)
+    # Mismo tamaño, otra fecha
+    escribir("a.txt", "dos", mtime_ns=10 ** 18 + 1)
+    assert leer(ruta) == "dos"
+    assert len(llamadas) == 2
+
+
+def test_recalcula_si_cambia_el_tamano(cache):
+    leer, llamadas, escribir = cache
+    ruta = escribir("a.txt", "uno", mtime_ns=10 ** 18)
+    leer(ruta)
+    # Misma fecha, otro tamaño
+    escribir("a.txt", "uno más", mtime_ns=10 ** 18)
+    assert leer(ruta) == "uno más"
+    assert len(llamadas) == 2
+
+
+def test_invalidar_descarta_solo_esa_fuente(cache):
+    leer, llamadas, escribir = cache
+    a, b = escribir("a.txt", "uno"), escribir("b.txt", "dos")
+    leer(a), leer(b)
+
+    assert huellas.invalidar(a) == 1
+    assert leer.estadisticas()["entradas"] == 1
+    leer(a), leer(b)
+    assert llamadas == [a, b, a]
+
+    assert huellas.invalidar() == 2
+    assert leer.estadisticas()["entradas"] == 0
+
+
+def test_rerun_reutiliza_el_cache(cache):
+    leer, llamadas, escribir = cache
+    ruta = escribir("a.txt", "uno")
+    leer(ruta)
+
+    # Streamlit vuelve a ejecutar el script: el decorador se aplica de nuevo con el mismo nombre
+    @cache_por_huella(fuentes=lambda path: [path], nombre=leer.nombre)
+    def leer_otra_vez(path):
+        raise AssertionError("no debe recalcular")
+
+    assert leer_otra_vez(ruta) == "uno"
+    assert len(huellas.REGISTRO) == 1
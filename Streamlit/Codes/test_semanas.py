@@ -0,0 +1,101 @@
+# test_semanas.py
+"""
+El año de las semanas sale de los datos, no del reloj: la semana 43 del libro
+incluido es 2025Sem43 se lea cuando se lea.
+"""
+import datetime
+import importlib
+import os
+
+import pandas as pd
+import pytest
+
+import esquema
+import indices
+import ingesta
+import preparacion
+from almacen import AlmacenSemanal
+
+RECURSOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Resources")
+LIBRO = os.path.join(RECURSOS, "Data", "op_sl_sem43.xlsx")
+CSV = os.path.join(RECURSOS, "Data", "one_page_sem42.csv")
+
+# Fechas de lectura: la semana del libro, la misma semana un año después y un enero
+HOYS = [(2025, 10, 28), (2026, 10, 26), (2027, 1, 4)]
+
+
+def reloj(hoy):
+    """date y datetime cuyo today()/now() devuelven 'hoy'."""
+    class Fecha(datetime.date):
+        @classmethod
+        def today(cls):
+            return cls(*hoy)
+
+    class FechaHora(datetime.datetime):
+        @classmethod
+        def today(cls):
+            return cls(*hoy)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls(*hoy, tzinfo=tz)
+
+    return Fecha, FechaHora
+
+
+@pytest.fixture
+def recargar(monkeypatch):
+    """Recarga los módulos de semanas con el reloj falso (y al final con el real)."""
+    modulos = [esquema, ingesta, indices, preparacion]
+
+    def con_reloj(hoy):
+        fecha, fecha_hora = reloj(hoy)
+        monkeypatch.setattr(datetime, "date", fecha)
+        monkeypatch.setattr(datetime, "datetime", fecha_hora)
+        for modulo in modulos:
+            importlib.reload(modulo)
+        # Sin carpeta ni año fijados por el entorno de quien corre las pruebas
+        for modulo in (ingesta, preparacion):
+            monkeypatch.setattr(modulo, "CONFIG", modulo.CONFIG._replace(semana="", anio=""))
+        assert datetime.date.today() == datetime.date(*hoy)
+
+    yield con_reloj
+    monkeypatch.undo()
+    for modulo in modulos:
+        importlib.reload(modulo)
+
+
+@pytest.mark.parametrize("hoy", HOYS)
+def test_carpeta_no_depende_del_reloj(recargar, hoy):
+    recargar(hoy)
+    hoja = ingesta.agregar_anio(pd.read_excel(LIBRO, sheet_name="one_page", engine="openpyxl"), LIBRO)
+    indice = indices.IndiceSemanas(preparacion.preparar_datos(hoja))
+
+    _, hasta = indice.ultimas(4)
+    assert hasta == 202543
+    assert preparacion.semana_graficas(hasta) == "2025Sem43"
+
+
+@pytest.mark.parametrize("hoy", HOYS)
+def test_sin_anio_no_adivina(recargar, hoy):
+    """Un .csv sin columna 'anio' ni año en el nombre pide el año en lugar de tomar el del reloj."""
+    recargar(hoy)
+    with pytest.raises(ValueError, match="año"):
+        ingesta.agregar_anio(pd.read_csv(CSV), CSV)
+    assert set(ingesta.agregar_anio(pd.read_csv(CSV), CSV, anio=2025)["anio"]) == {2025}
+
+
+def test_cruce_de_anio():
+    """Las semanas altas de un archivo que cruza el fin de año son del año anterior."""
+    semanas = pd.DataFrame({"semana": [50, 51, 52, 1, 2]})
+    anios = ingesta.agregar_anio(semanas, "one_page_2026.csv")["anio"].tolist()
+    assert anios == [2025, 2025, 2025, 2026, 2026]
+
+
+@pytest.mark.parametrize("semana, filas", [(202543, True), (202542, False)])
+def test_graficas_de_la_semana(monkeypatch, tmp_path, semana, filas):
+    """Sin la semana en el almacén, la hoja 'graficas' del libro sólo sirve si es de esa semana."""
+    monkeypatch.setattr(preparacion, "AlmacenSemanal", lambda hoja: AlmacenSemanal(tmp_path, hoja=hoja))
+    hoja = preparacion.hoja_graficas(LIBRO, semana)
+    assert not hoja.empty if filas else hoja.empty
+    assert set(esquema.claves_semana(hoja)) <= {semana}
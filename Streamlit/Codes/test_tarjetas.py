@@ -0,0 +1,188 @@
+# test_tarjetas.py
+"""
+Las filas semanales de las tarjetas (formatear_filas + macro fila_semana)
+deben ser idénticas, byte a byte, a las que armaba el dashboard original con
+iterrows y generar_medalla, que se conservan aquí como referencia.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import consultas
+from almacen import agregar_archivo
+from esquema import ESQUEMA_HECHOS, PORCENTAJES
+from indices import IndiceSemanas
+from ingesta import leer_hoja
+from preparacion import preparar_datos
+from tarjetas import construir_datos_tarjetas, entorno_plantillas, formatear_filas
+
+# Recursos incluidos en el repositorio (no los de la configuración local)
+RECURSOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Resources")
+LIBRO = os.path.join(RECURSOS, "Data", "op_sl_sem43.xlsx")
+PLANTILLAS = os.path.join(RECURSOS, "Templates")
+
+
+# ---------- Referencia: el render original por celda ----------
+def generar_medalla(valor, tipo="porcentaje"):
+    tipo2 = ""
+    if valor is None or pd.isna(valor):
+        return ""
+    # Si es porcentaje en formato decimal, lo pasamos a 0–100
+    if valor <= 1 and valor >= 0:
+        val = valor * 100
+        tipo2 = "porcentaje"
+    else:
+        val = valor
+    # Reglas por tipo
+    reglas = {
+        "contacto": {
+            "verde": lambda v: v >= 65,
+            "amarillo": lambda v: 40 <= v < 65,
+            "rojo": lambda v: v < 40
+        },
+        "promesas_cumplidas": {
+            "verde": lambda v: v >= 60,
+            "amarillo": lambda v: 40 <= v < 60,
+            "rojo": lambda v: v < 40
+        },
+        "logro_meta": {
+            "verde": lambda v: v >= 70,
+            "amarillo": lambda v: 50 <= v < 70,
+            "rojo": lambda v: v < 50
+        },
+        "visitas": {
+            "verde": lambda v: v >= 15,
+            "amarillo": lambda v: 10 <= v < 15,
+            "rojo": lambda v: v < 10
+        },
+        "plantilla": {
+            "verde": lambda v: v >= 90,
+            "amarillo": lambda v: 80 <= v < 90,
+            "rojo": lambda v: v < 80
+        }
+    }
+    # Determinar color según las reglas
+    if tipo in reglas:
+        if reglas[tipo]["verde"](val):
+            color = "#32CD32"  # verde
+        elif reglas[tipo]["amarillo"](val):
+            color = "#FFD700"  # amarillo
+        else:
+            color = "#FF4C4C"  # rojo
+    else:
+        color = "#808080"  # gris por defecto
+    # Formato del valor mostrado
+    texto_valor = f"{val:.1f}%" if tipo2 == "porcentaje" else f"{int(val):,}"
+    # HTML del círculo + valor
+    return f"""<span style="display:inline-flex; align-items:center; gap:4px;">
+        <span style="width:10px; height:10px; border-radius:50%; background-color:{color}; display:inline-block;"></span>
+        <span>{texto_valor}</span>
+    </span>"""
+
+
+def filas_originales(datos):
+    filas = []
+    for _, fila in datos.iterrows():
+        semana = fila.get("semana", "")
+        plantilla = fila.get("plantilla", "")
+        horas_visita = fila.get("horas_visita", "")
+        visitas_totales = fila.get("visitas_totales", "")
+        visitas = fila.get("visitas", "")
+        contacto = fila.get("contacto", "")
+        promesas_contacto = fila.get("promesas_contacto", "")
+        promesas_cumplidas = fila.get("promesas_cumplidas", "")
+        logro = fila.get("logros_meta", "")
+        monto = fila.get("monto", 0)
+
+        visitas_html = generar_medalla(visitas, tipo="visitas")
+        plantilla_html = generar_medalla(plantilla, tipo="plantilla")
+        contacto_html = generar_medalla(contacto, tipo="contacto")
+        promesas_contacto_html = generar_medalla(promesas_contacto, tipo="contacto")
+        promesas_cumplidas_html = generar_medalla(promesas_cumplidas, tipo="promesas_cumplidas")
+        logro_html = generar_medalla(logro, tipo="logro_meta")
+
+        monto_str = f"${int(monto):,}" if not pd.isna(monto) else "-"
+
+        filas.append(f"""<div class="semana-row">
+            <div>{semana}</div>
+            <div>{plantilla_html}</div>
+            <div>{horas_visita:.1f}</div>
+            <div>{visitas_totales:.0f}</div>
+            <div>{visitas_html}</div>
+            <div>{contacto_html}</div>
+            <div>{promesas_contacto_html}</div>
+            <div>{promesas_cumplidas_html}</div>
+            <div>{monto_str}</div>
+            <div>{logro_html}</div>
+        </div>""")
+    return filas
+
+
+# ---------- Render actual ----------
+def filas_actuales(semanal):
+    macros = entorno_plantillas(PLANTILLAS).get_template("macros.html").module
+    return [str(macros.fila_semana(fila)) for fila in formatear_filas(semanal)]
+
+
+# ---------- Pruebas ----------
+def test_filas_libro():
+    """Todas las filas del libro incluido, en el orden de las tarjetas (nombre, semana)."""
+    hoja = pd.read_excel(LIBRO, sheet_name="one_page", engine="openpyxl")
+    hoja.fillna(0, inplace=True)
+    hoja.rename(columns={"meta": "logros_meta"}, inplace=True)
+    referencia = hoja.sort_values(by=["nombre", "semana"], kind="stable")
+
+    semanal, _ = construir_datos_tarjetas(preparar_datos(leer_hoja(LIBRO, "one_page")))
+
+    assert len(semanal) == len(referencia)
+    assert filas_actuales(semanal) == filas_originales(referencia)
+
+
+# Bordes de las reglas: nulos, negativos, 0 y 1, umbrales y redondeos a un decimal
+VALORES = [
+    np.nan, -3.0, -1.5, -0.25, -0.0, 0.0, 0.0165, 0.0449, 0.4, 0.5, 0.6, 0.6505, 0.65,
+    0.7, 0.8, 0.9, 0.99949, 0.9995, 1.0, 1.0000001, 9.99, 10.0, 14.5, 15.0, 1234.56, 98765.4,
+]
+
+
+@pytest.mark.parametrize("desfase", range(4))
+def test_filas_bordes(desfase):
+    n = len(VALORES)
+    columna = lambda k: [VALORES[(i + k * desfase) % n] for i in range(n)]
+    semanal = pd.DataFrame({
+        "nombre": ["Cobrador"] * n,
+        "semana": np.arange(1, n + 1, dtype="int16"),
+        "plantilla": columna(0),
+        "horas_visita": columna(1),
+        "visitas_totales": columna(2),
+        "visitas": columna(3),
+        "contacto": columna(4),
+        "promesas_contacto": columna(5),
+        "promesas_cumplidas": columna(6),
+        "monto": columna(7),
+        "logros_meta": columna(8),
+    })
+    # Los porcentajes con el tipo del esquema, como llegan desde preparar_datos
+    tipados = semanal.astype({col: ESQUEMA_HECHOS[col] for col in PORCENTAJES})
+    assert filas_actuales(tipados) == filas_originales(semanal)
+
+
+# Cambio de zona a mitad del historial: el perfil es el de la primera semana mostrada
+@pytest.mark.parametrize("desde, zona", [(202542, "Norte"), (202543, "Sur")])
+def test_perfil_del_rango(tmp_path, desde, zona):
+    hoja = pd.read_excel(LIBRO, sheet_name="one_page", engine="openpyxl")
+    hoja = pd.concat([hoja.assign(semana=42, zona="Norte"), hoja.assign(semana=43, zona="Sur")], ignore_index=True)
+    hoja["anio"] = 2025
+    csv = tmp_path / "one_page_2025.csv"
+    hoja.to_csv(csv, index=False)
+
+    _, libro = construir_datos_tarjetas(IndiceSemanas(preparar_datos(hoja.copy())).rango(desde, 202543))
+    assert set(libro["zona"].astype(str)) == {zona}
+
+    if not consultas.DUCKDB_DISPONIBLE:
+        pytest.skip("duckdb no está instalado")
+    agregar_archivo(str(csv), str(tmp_path / "almacen"))
+    _, sql = consultas.agregados_tarjetas(str(tmp_path / "almacen"), desde, 202543, preparar_datos)
+    assert set(sql["zona"].astype(str)) == {zona}